@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PilotlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pilotlog'
+
+    def ready(self):
+        # Connect the cache invalidation signal handlers
+        from . import signals  # noqa: F401
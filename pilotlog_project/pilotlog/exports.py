@@ -0,0 +1,283 @@
+import io
+import os
+import csv
+import gzip
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from django.db import connection
+from .models import Aircraft, Flight
+
+# Buffer size for the CSV output files; a large buffer keeps write() syscalls down
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# gzip level used when compressing; level 1 is far cheaper than the default 9 and
+# still shrinks the repetitive CSV output several times over
+GZIP_COMPRESS_LEVEL = 1
+
+# Boolean columns are written as 'Yes'/'No', indexed by bool(value)
+_YN = ('No', 'Yes')
+
+# Header rows of the exported CSV files
+AIRCRAFT_HEADERS = (
+    "AircraftID", "EquipmentType", "TypeCode", "Year", "Make", "Model", "Category",
+    "Class", "GearType", "EngineType", "Complex", "HighPerformance", "Pressurized", "TAA"
+)
+
+FLIGHT_HEADERS = (
+    "Date", "AircraftID", "From", "To", "Route", "TimeOut", "TimeOff", "TimeOn", "TimeIn",
+    "OnDuty", "OffDuty", "TotalTime", "PIC", "SIC", "Night", "Solo", "CrossCountry",
+    "NVG", "NVGOps", "Distance", "DayTakeoffs", "DayLandingsFullStop", "NightTakeoffs",
+    "NightLandingsFullStop", "AllLandings", "ActualInstrument", "SimulatedInstrument",
+    "HobbsStart", "HobbsEnd", "TachStart", "TachEnd", "Holds", "Approach1", "Approach2",
+    "Approach3", "Approach4", "Approach5", "Approach6", "DualGiven", "DualReceived",
+    "SimulatedFlight", "GroundTraining", "InstructorName", "InstructorComments",
+    "Person1", "Person2", "Person3", "Person4", "Person5", "Person6", "FlightReview",
+    "Checkride", "IPC", "NVGProficiency", "FAA6158", "[Text]CustomFieldName",
+    "[Numeric]CustomFieldName", "[Hours]CustomFieldName", "[Counter]CustomFieldName",
+    "[Date]CustomFieldName", "[DateTime]CustomFieldName", "[Toggle]CustomFieldName",
+    "PilotComments"
+)
+
+# Columns read from the database for each export, in the order they are unpacked
+AIRCRAFT_FIELDS = (
+    'guid', 'record_modified', 'make', 'model', 'category', 'aircraft_class',
+    'complex', 'high_perf', 'aerobatic'
+)
+
+# One entry per FLIGHT_HEADERS column; None marks a column with no source field,
+# which is written as an empty cell so every row has as many cells as the header
+FLIGHT_FIELDS = (
+    'date', 'aircraft_id', 'from_airport', 'to_airport', 'route',
+    'time_out', 'time_off', 'time_on', 'time_in', 'on_duty', 'off_duty',
+    'total_time', 'pic', 'sic', 'night', 'solo', 'cross_country', 'nvg', 'nvg_ops',
+    'distance', 'day_takeoffs', 'day_landings_full_stop', 'night_takeoffs',
+    'night_landings_full_stop', 'all_landings', 'actual_instrument',
+    'simulated_instrument', 'hobbs_start', 'hobbs_end', 'tach_start', 'tach_end',
+    'holds',
+    'approach', None, None, None, None, None,       # Approach1-6
+    'dual_given', None,                             # DualGiven, DualReceived
+    'simulated_flight', 'ground_training', 'instructor_name', 'instructor_comments',
+    None, None, None, None, None, None,             # Person1-6
+    'flight_review', 'checkride', 'ipc', 'nvg_proficiency',
+    None,                                           # FAA6158
+    None, None, None, None, None, None, None,       # Custom fields
+    'pilot_comments'
+)
+
+# Flight fields actually selected from the database
+FLIGHT_DB_FIELDS = tuple(name for name in FLIGHT_FIELDS if name)
+
+# Spreads a FLIGHT_DB_FIELDS row (with _BLANK appended) out to FLIGHT_HEADERS order
+_BLANK = ('',)
+_flight_row = itemgetter(*(
+    FLIGHT_DB_FIELDS.index(name) if name else len(FLIGHT_DB_FIELDS) for name in FLIGHT_FIELDS
+))
+
+# Rows fetched per query when paging through a table
+PAGE_SIZE = 10000
+
+
+def iter_paged(queryset, fields, page_size=None):
+    """
+    Yields pages (lists) of ``fields`` tuples from ``queryset`` in primary key order.
+
+    Each page is its own short query (``WHERE id > last ORDER BY id LIMIT page_size``)
+    driven by the primary key index, so no single statement holds the connection for
+    the whole export. ``page_size`` defaults to PAGE_SIZE.
+    """
+    page_size = page_size or PAGE_SIZE
+    last_pk = 0
+    while True:
+        page = list(
+            queryset.filter(pk__gt=last_pk).order_by('pk').values_list('pk', *fields)[:page_size]
+        )
+        if not page:
+            return
+        last_pk = page[-1][0]
+        yield [row[1:] for row in page]
+
+
+def open_output(file_path, compress=False):
+    """
+    Opens an output file for binary writing with a large buffer, gzip-compressed
+    when ``compress`` is set.
+    """
+    if compress:
+        return io.BufferedWriter(
+            gzip.GzipFile(file_path, 'wb', compresslevel=GZIP_COMPRESS_LEVEL),
+            buffer_size=WRITE_BUFFER_SIZE,
+        )
+    return open(file_path, 'wb', buffering=WRITE_BUFFER_SIZE)
+
+
+def open_csv(file_path, compress=False):
+    """
+    Opens a CSV output file for writing.
+
+    The file is opened in binary mode with a large buffer, and a UTF-8 text layer
+    is put on top for the csv module; the encoding is fixed rather than taken
+    from the locale, so every row goes through the same fast UTF-8 encoder.
+    """
+    return io.TextIOWrapper(open_output(file_path, compress), encoding='utf-8', newline='')
+
+
+def export_aircraft_to_csv(file_path, compress=False):
+    """Exports aircraft data to a CSV file and returns the number of rows written."""
+
+    # Yield data rows for the CSV file one at a time, positionally in header order
+    def rows(aircrafts):
+        for guid, record_modified, make, model, category, aircraft_class, complex, high_perf, aerobatic in aircrafts:
+            yield (
+                guid,
+                "",                 # Placeholder for 'EquipmentType'
+                "",                 # Placeholder for 'TypeCode'
+                record_modified,    # Assuming 'record_modified' maps to 'Year'
+                make,
+                model,
+                category,
+                aircraft_class,
+                "",                 # Placeholder for 'GearType'
+                "",                 # Placeholder for 'EngineType'
+                _YN[bool(complex)],
+                _YN[bool(high_perf)],
+                "",                 # Placeholder for 'Pressurized'
+                _YN[bool(aerobatic)]
+            )
+
+    # Retrieve only the aircraft columns we need, as plain tuples, page by page,
+    # and write the rows to the CSV file as they are produced
+    count = 0
+    with open_csv(file_path, compress) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(AIRCRAFT_HEADERS)
+        for page in iter_paged(Aircraft.objects.all(), AIRCRAFT_FIELDS):
+            writer.writerows(rows(page))
+            count += len(page)
+
+    return count
+
+
+def export_flights_to_csv(file_path, compress=False):
+    """Exports flight data to a CSV file and returns the number of rows written."""
+
+    # On PostgreSQL let the server stream the CSV itself
+    if connection.vendor == 'postgresql':
+        return copy_flights_to_csv(file_path, compress)
+
+    # Open the file for writing the flight data
+    count = 0
+    with open_csv(file_path, compress) as file:
+        writer = csv.writer(file)
+        writer.writerow(FLIGHT_HEADERS)
+
+        # Page through flight rows by primary key; the aircraft id is the raw FK
+        # column, so no join or related-object access is needed. Each tuple is
+        # spread out to header order and a page goes to writerows in a single call.
+        # Route and the comment columns are free text (remarks may contain commas,
+        # quotes or newlines), so rows stay on the C csv writer for escaping rather
+        # than being joined by hand.
+        for page in iter_paged(Flight.objects.all(), FLIGHT_DB_FIELDS):
+            writer.writerows(_flight_row(row + _BLANK) for row in page)
+            count += len(page)
+
+    return count
+
+
+def copy_flights_to_csv(file_path, compress=False):
+    """
+    Exports flight data with PostgreSQL's COPY ... TO STDOUT, bypassing Python row handling,
+    and returns the number of rows written.
+
+    The SELECT mirrors FLIGHT_FIELDS and formats values the way csv.writer would:
+    booleans as True/False, whole floats with a trailing '.0' as str(float)
+    writes them (PostgreSQL prints float8 60 as '60'), and empty text and
+    columns without a source field as empty (unquoted) cells. Rows are
+    terminated with '\n' rather than csv's '\r\n'.
+    """
+    columns = []
+    for name in FLIGHT_FIELDS:
+        if name is None:
+            columns.append('NULL')
+            continue
+        field = Flight._meta.get_field(name)
+        column = connection.ops.quote_name(field.column)
+        internal_type = field.get_internal_type()
+        if internal_type == 'BooleanField':
+            column = f"CASE WHEN {column} THEN 'True' ELSE 'False' END"
+        elif internal_type == 'FloatField':
+            # abs() < 1e16 is false for NaN and infinities, which str(float) also
+            # writes without '.0', as it does for whole values in exponent form
+            column = (
+                f"CASE WHEN {column} = trunc({column}) AND abs({column}) < 1e16 "
+                f"THEN {column}::text || '.0' ELSE {column}::text END"
+            )
+        elif internal_type in ('CharField', 'TextField'):
+            column = f"NULLIF({column}, '')"
+        columns.append(column)
+
+    sql = "COPY (SELECT {} FROM {}) TO STDOUT WITH CSV".format(
+        ', '.join(columns), connection.ops.quote_name(Flight._meta.db_table)
+    )
+
+    with open_output(file_path, compress) as file:
+        # Header row goes through csv so it is quoted the same as the fallback path
+        header = io.StringIO()
+        csv.writer(header).writerow(FLIGHT_HEADERS)
+        file.write(header.getvalue().encode('utf-8'))
+
+        with connection.cursor() as cursor:
+            raw_cursor = cursor.cursor
+            if hasattr(raw_cursor, 'copy_expert'):
+                # psycopg2
+                raw_cursor.copy_expert(sql, file)
+            else:
+                # psycopg 3
+                with raw_cursor.copy(sql) as copy:
+                    for data in copy:
+                        file.write(data)
+            # COPY reports the number of rows it produced
+            return raw_cursor.rowcount
+
+
+def _run_in_thread(export, file_path, compress):
+    """
+    Runs an export function from a worker thread.
+
+    Django opens a separate database connection per thread, so close it once
+    the export is done instead of leaving it to leak with the thread.
+    """
+    try:
+        return export(file_path, compress)
+    finally:
+        connection.close()
+
+
+def run_export(out_dir, compress=False):
+    """
+    Exports aircraft and flight data to CSV files in ``out_dir``.
+
+    The files are named export_aircraft.csv and export_flight.csv (with a .gz suffix
+    when ``compress`` is set). Returns a tuple of (aircraft rows, flight rows) written.
+    This is the entry point for the export_data command and for any background job
+    that runs the export outside a request.
+    """
+    file_aircraft = os.path.join(out_dir, 'export_aircraft.csv')
+    file_flight = os.path.join(out_dir, 'export_flight.csv')
+    if compress:
+        file_aircraft += '.gz'
+        file_flight += '.gz'
+
+    # Ensure the directory exists; if not, create it
+    os.makedirs(out_dir, exist_ok=True)
+
+    # The two exports read different tables into different files, so run them side by side
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(_run_in_thread, export_aircraft_to_csv, file_aircraft, compress),
+            executor.submit(_run_in_thread, export_flights_to_csv, file_flight, compress),
+        ]
+        for future in as_completed(futures):
+            future.result()
+
+    aircraft_count, flight_count = (future.result() for future in futures)
+    return aircraft_count, flight_count
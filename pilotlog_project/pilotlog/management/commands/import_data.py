@@ -1,11 +1,65 @@
-import json
+import io
 import os
+import re
 import uuid
-from datetime import datetime
-from decimal import Decimal, InvalidOperation
+from collections import defaultdict
+from datetime import date
+from functools import lru_cache, partial
+import ijson
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    # orjson is optional; the standard library parser gives the same result, only slower
+    from json import loads as json_loads
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from pilotlog.models import *
+from django.db import DataError, IntegrityError, OperationalError, connection, transaction
+from pilotlog.models import (
+    Aircraft, Flight, ImagePic, LimitRules, Query, MyQueryBuild, Pilot, Qualification,
+    SettingConfig, Airfield
+)
+from pilotlog.signals import clear_image_cache
+
+# YYYY-MM-DD, with month and day zero-padded or not, as strptime('%Y-%m-%d') accepts
+_DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+
+
+# A logbook repeats the same dates over and over, so the parsed values are
+# cached; dates are immutable and safe to share between records. The regex and
+# date() replace strptime, whose pure-Python _strptime path is several times slower.
+@lru_cache(maxsize=65536)
+def _parse_date(value):
+    match = _DATE_RE.fullmatch(value)
+    if match is None:
+        raise ValueError(f'time data {value!r} does not match format YYYY-MM-DD')
+    return date(int(match[1]), int(match[2]), int(match[3]))
+
+
+# Bytes ijson reads from the JSON file per call; read() hands chunks this large
+# straight to the parser, so one syscall covers a whole MiB of the export
+READ_BUFFER_SIZE = 1024 * 1024
+
+# Per-connection SQLite settings for the load: a 256 MiB page cache, temporary
+# b-trees in memory and memory-mapped reads; restored once the import is done
+SQLITE_LOAD_PRAGMAS = {
+    'cache_size': -262144,
+    'temp_store': 'MEMORY',
+    'mmap_size': 268435456,
+}
+
+# Canonical 8-4-4-4-12 hex GUID, as used throughout the MCC export
+_GUID_RE = re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}')
+
+# Field types whose database value is just their Python value coerced by
+# get_prep_value() (float(), int(), str(), bool()); see Command.row_converters()
+_PLAIN_FIELD_TYPES = frozenset({
+    'BooleanField', 'CharField', 'FloatField', 'IntegerField', 'BigIntegerField',
+    'SmallIntegerField', 'PositiveIntegerField', 'PositiveSmallIntegerField', 'TextField',
+})
+
+# Characters that must be backslash-escaped in PostgreSQL's COPY text format
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
 
 class Command(BaseCommand):
     """
@@ -30,34 +84,584 @@ class Command(BaseCommand):
         'airfield': "import_airfield"
     }
 
+    # Model and conflict (unique) fields for each table; records are upserted on these
+    # fields, in this order, so aircraft rows exist before the flights that point at them
+    Table_Models = {
+        'aircraft': (Aircraft, ['guid']),
+        'flight': (Flight, ['guid']),
+        'imagepic': (ImagePic, ['guid']),
+        'limitrules': (LimitRules, ['limit_code']),
+        'myquery': (Query, ['guid']),
+        'myquerybuild': (MyQueryBuild, ['guid']),
+        'pilot': (Pilot, ['guid']),
+        'qualification': (Qualification, ['guid']),
+        'settingconfig': (SettingConfig, ['guid']),
+        'airfield': (Airfield, ['guid'])
+    }
+
+    # Model fields the importer does not fill in; existing rows keep their stored value
+    Unmapped_Fields = {
+        'flight': ('instructor_name',),
+    }
+
+    # Records buffered per table before they are written in one multi-row upsert
+    Batch_Size = 1000
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Resolve Table_Mapping to bound methods once, rather than per record
+        self._dispatch = {
+            table_name: getattr(self, method_name)
+            for table_name, method_name in self.Table_Mapping.items()
+        }
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=os.path.join(
+                settings.BASE_DIR, 'pilotlog', 'required_resource', 'import - pilotlog_mcc.json'
+            ),
+            help='Path of the JSON export to import (default: the sample export in '
+                 'pilotlog/required_resource)',
+        )
+        parser.add_argument(
+            '--progress-every',
+            type=int,
+            default=10000,
+            help='Print a progress line every N records (0 to disable). Per-record '
+                 'messages are only printed with --verbosity 2 or higher.',
+        )
+        parser.add_argument(
+            '--drop-indexes',
+            action='store_true',
+            help='Drop the secondary (Meta.indexes) indexes of the imported tables during '
+                 'the load and rebuild them afterwards; worthwhile for large imports.',
+        )
+        parser.add_argument(
+            '--no-stream',
+            action='store_true',
+            help='Parse the whole JSON file in one go (with orjson when installed) instead '
+                 'of streaming it; faster, but the file is held in memory.',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-import every record, including those whose _modified timestamp '
+                 'matches the row already stored.',
+        )
+
     def handle(self, *args, **kwargs):
         """
         Entry point for the command. This method reads the JSON file, parses the data,
         and directs each record to the appropriate import method based on the table name.
         """
-        # Path to the JSON file (modify as needed)
-        json_file_path = os.path.join(
-            settings.BASE_DIR, 'pilotlog', 'required_resource', 'import - pilotlog_mcc.json'
-        )
+        json_file_path = kwargs['path']
         self.stdout.write(self.style.SUCCESS("Successfully opened JSON file"))
         self.stdout.write(f"JSON file path: {json_file_path}")
-        
-        # Open and load the JSON data
-        with open(json_file_path, 'r', encoding='utf-8') as json_file:
-            data = json.load(json_file)
-        
-        # Iterate over each record in the JSON data
-        for record in data:
-            table_name = record['table'].lower()  # Convert table name to lowercase
-            
-            # Find and call the appropriate import method
-            method_name = self.Table_Mapping.get(table_name)
-            if method_name:
-                method_to_call = getattr(self, method_name)
-                method_to_call(record)
-                self.stdout.write(self.style.SUCCESS(f'Successfully imported {table_name} record: {record["guid"]}'))
+
+        self.verbosity = kwargs.get('verbosity', 1)
+        self.progress_every = kwargs.get('progress_every', 10000)
+        self.stream = not kwargs.get('no_stream', False)
+        self.force = kwargs.get('force', False)
+
+        # Schema changes run outside the import transaction: SQLite cannot alter
+        # the schema inside atomic(), and PostgreSQL cannot build an index
+        # concurrently inside a transaction
+        dropped_indexes = self.drop_indexes() if kwargs.get('drop_indexes') else []
+        # Session settings are only changed in a transaction the import owns; inside
+        # a caller's transaction SET LOCAL would outlive the import and SQLite
+        # refuses some pragmas
+        outermost = not connection.in_atomic_block
+        try:
+            # Run the whole load in one transaction so it commits (and syncs to disk)
+            # once instead of once per statement, and a failed import leaves no partial data
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    restore = self.tune_session(cursor) if outermost else []
+                try:
+                    self.import_file(json_file_path)
+                finally:
+                    with connection.cursor() as cursor:
+                        for statement in restore:
+                            cursor.execute(statement)
+            # Images are written in bulk, which sends no post_save signals
+            clear_image_cache(ImagePic)
+        finally:
+            if dropped_indexes:
+                self.restore_indexes(dropped_indexes)
+
+    def tune_session(self, cursor):
+        """
+        Adjust the database session for a bulk load.
+
+        On PostgreSQL, foreign keys are checked at commit rather than after every
+        statement, and the commit does not wait for the WAL flush (a crash right
+        after the import can lose it, but never corrupts data; the import can
+        simply be run again). These are SET LOCAL, so they end with the import
+        transaction. On SQLite, those SQLITE_LOAD_PRAGMAS the connection accepts are applied.
+
+        Parameters:
+            cursor (CursorWrapper): A cursor inside the import transaction.
+
+        Returns:
+            list: Statements that restore the previous settings.
+        """
+        if connection.vendor == 'postgresql':
+            cursor.execute('SET CONSTRAINTS ALL DEFERRED')
+            cursor.execute('SET LOCAL synchronous_commit TO off')
+            cursor.execute("SET LOCAL work_mem TO '64MB'")
+            return []
+        if connection.vendor == 'sqlite':
+            restore = []
+            for name, value in SQLITE_LOAD_PRAGMAS.items():
+                cursor.execute(f'PRAGMA {name}')
+                current = cursor.fetchone()
+                if current is None:
+                    # Not available for this database, e.g. mmap_size in memory
+                    continue
+                try:
+                    cursor.execute(f'PRAGMA {name} = {value}')
+                except OperationalError:
+                    # temp_store cannot change once the connection has opened its
+                    # temporary storage; the pragmas only speed the load up
+                    continue
+                restore.append(f'PRAGMA {name} = {current[0]}')
+            return restore
+        return []
+
+    def drop_indexes(self):
+        """
+        Drop the Meta.indexes of every imported model, so the load does not have
+        to maintain them row by row. Unique constraints (guid and friends) are
+        kept, as the upsert relies on them to detect conflicts.
+
+        Returns:
+            list: (model, index) pairs that were dropped, for restore_indexes().
+        """
+        dropped = []
+        with connection.schema_editor() as schema_editor:
+            for model, _ in self.Table_Models.values():
+                for index in model._meta.indexes:
+                    schema_editor.remove_index(model, index)
+                    dropped.append((model, index))
+        if dropped:
+            self.stdout.write(f'Dropped {len(dropped)} indexes for the import')
+        return dropped
+
+    def restore_indexes(self, dropped):
+        """
+        Recreate the indexes removed by drop_indexes(). On PostgreSQL they are
+        built concurrently, so the tables stay writable while they build.
+
+        Parameters:
+            dropped (list): (model, index) pairs returned by drop_indexes().
+        """
+        if connection.vendor == 'postgresql':
+            with connection.schema_editor(atomic=False) as schema_editor:
+                for model, index in dropped:
+                    schema_editor.add_index(model, index, concurrently=True)
+        else:
+            with connection.schema_editor() as schema_editor:
+                for model, index in dropped:
+                    schema_editor.add_index(model, index)
+        self.stdout.write(f'Rebuilt {len(dropped)} indexes')
+
+    def import_file(self, json_file_path):
+        """
+        Read every record from the JSON file and save it through the import
+        method for its table.
+
+        Parameters:
+            json_file_path (str): Path to the JSON export to import.
+        """
+        # Unsaved instances per table, keyed on their conflict fields so a record
+        # repeated in the file replaces the earlier one, as update_or_create did
+        self.buffers = defaultdict(dict)
+        # Aircraft GUID -> primary key, loaded when flights are first written
+        self.aircraft_pks = None
+        # Flights held back because their aircraft had not been read yet; see flush_buffers()
+        self.deferred_flights = {}
+        # (table, conflict key) of rows the database rejected; see write_batch()
+        self.failed = []
+        # Stored _modified timestamps per table, keyed by GUID; see is_unchanged()
+        self.stored_modified = {}
+        skipped = 0
+
+        with open(json_file_path, 'rb') as json_file:
+            if self.stream:
+                # Stream the records one at a time; the file is a top-level array, so
+                # each 'item' is one record and the whole document is never held in memory
+                records = ijson.items(json_file, 'item', buf_size=READ_BUFFER_SIZE, use_float=True)
+            else:
+                # Parse the whole document in a single call
+                records = json_loads(json_file.read())
+            count = 0
+            for count, record in enumerate(records, 1):
+                table_name = record['table'].lower()  # Convert table name to lowercase
+                
+                # Find and call the appropriate import method
+                method_to_call = self._dispatch.get(table_name)
+                if method_to_call:
+                    # Parse the GUID once here; the import methods get the UUID object
+                    guid = self.parse_guid(record.get('guid'))
+                    if self.is_unchanged(table_name, guid, record):
+                        skipped += 1
+                    else:
+                        self.buffer_instance(table_name, method_to_call(record, guid), record)
+                else:
+                    self.stdout.write(self.style.WARNING(f'No import method for table: {table_name}'))
+
+                # One progress line every progress_every records rather than one per record
+                if self.progress_every and count % self.progress_every == 0:
+                    self.stdout.write(f'{count} records read ({table_name})')
+
+        # Write whatever is left in the buffers
+        self.flush_buffers(final=True)
+        self.stdout.write(self.style.SUCCESS(f'Read {count} records from {json_file_path}'))
+        if skipped:
+            self.stdout.write(f'Skipped {skipped} records unchanged since the last import')
+        if self.failed:
+            self.stdout.write(self.style.ERROR(f'{len(self.failed)} records could not be saved:'))
+            for table_name, key in self.failed:
+                self.stdout.write(self.style.ERROR(f'  {table_name}: {", ".join(map(str, key))}'))
+        self.report_flights()
+
+    def report_flights(self):
+        """
+        Report the number of stored flights and, at verbosity 2 and up, the most
+        recently modified ones with their aircraft.
+
+        The aircraft are joined in with select_related(), so listing them costs
+        one query rather than one per flight.
+        """
+        self.stdout.write(f'{Flight.objects.count()} flights in the database')
+        if self.verbosity < 2:
+            return
+        latest = Flight.objects.select_related('aircraft_id').order_by('-_modified')[:10]
+        for flight in latest:
+            aircraft = flight.aircraft_id
+            self.stdout.write(
+                f'  {flight.guid} {flight.date} {flight.from_airport}-{flight.to_airport} '
+                f'on {aircraft.make} {aircraft.model}'
+            )
+
+    def is_unchanged(self, table_name, guid, record):
+        """
+        Check whether a record is already stored with the same _modified timestamp,
+        in which case there is nothing to import. The stored timestamps of a table
+        are read in one query, the first time a record of that table comes up.
+
+        Parameters:
+            table_name (str): The lowercase table name of the record.
+            guid (UUID): The record's parsed GUID, or None if it is invalid.
+            record (dict): The record being imported.
+
+        Returns:
+            bool: True if the record can be skipped.
+        """
+        if guid is None or self.force:
+            return False
+        stored = self.stored_modified.get(table_name)
+        if stored is None:
+            model = self.Table_Models[table_name][0]
+            stored = self.stored_modified[table_name] = dict(model.objects.values_list('guid', '_modified'))
+        # A record without _modified must not match a GUID that is not stored
+        return guid in stored and stored[guid] == record.get('_modified')
+
+    def buffer_instance(self, table_name, instance, record):
+        """
+        Queue an instance built by an import method for the next bulk write,
+        flushing the buffers once this table's buffer is full.
+
+        Parameters:
+            table_name (str): The lowercase table name of the record.
+            instance (Model): The unsaved instance, or None if the record was rejected.
+            record (dict): The record the instance was built from.
+        """
+        if instance is None:
+            return
+        unique_fields = self.Table_Models[table_name][1]
+        buffer = self.buffers[table_name]
+        buffer[tuple(getattr(instance, field) for field in unique_fields)] = instance
+        if self.verbosity >= 2:
+            self.stdout.write(self.style.SUCCESS(f'Successfully imported {table_name} record: {record["guid"]}'))
+        if len(buffer) >= self.Batch_Size:
+            self.flush_buffers()
+
+    def resolve_aircraft(self, flights):
+        """
+        Point each flight at the Aircraft named by its AircraftCode.
+
+        Aircraft primary keys are read in one query and kept until more aircraft
+        are written, instead of being looked up per flight. Flights whose
+        aircraft is not in the database keep the model's default aircraft.
+
+        Parameters:
+            flights (iterable): Unsaved Flight instances from import_flights().
+        """
+        if self.aircraft_pks is None:
+            self.aircraft_pks = dict(Aircraft.objects.values_list('guid', 'pk'))
+        for flight in flights:
+            aircraft_pk = self.aircraft_pks.get(flight.aircraft_guid)
+            if aircraft_pk is not None:
+                flight.aircraft_id_id = aircraft_pk
+
+    def flush_buffers(self, final=False):
+        """
+        Write every buffered instance to the database and empty the buffers.
+
+        Each table is written with an INSERT ... ON CONFLICT DO UPDATE upsert
+        instead of a SELECT plus INSERT/UPDATE per record: through COPY on
+        PostgreSQL, executemany() on SQLite and bulk_create elsewhere.
+        All tables are flushed together, in Table_Models order, so a flight never
+        reaches the database before the aircraft row it references.
+
+        A flight whose aircraft comes later in the file would otherwise be saved
+        with the default aircraft, so until the final flush such flights are held
+        back and retried with the next batch.
+
+        Parameters:
+            final (bool): Whether this is the last flush, after the whole file was read.
+        """
+        for table_name, (model, unique_fields) in self.Table_Models.items():
+            buffer = self.buffers.pop(table_name, None) or {}
+            if model is Flight:
+                # Newer records in the buffer replace held-back ones with the same GUID
+                buffer = {**self.deferred_flights, **buffer}
+                self.resolve_aircraft(buffer.values())
+                self.deferred_flights = {} if final else {
+                    key: flight for key, flight in buffer.items()
+                    if flight.aircraft_guid is not None and flight.aircraft_guid not in self.aircraft_pks
+                }
+                for key in self.deferred_flights:
+                    del buffer[key]
+            if not buffer:
+                continue
+            if model is Aircraft:
+                # New aircraft invalidate the cached primary keys
+                self.aircraft_pks = None
+            saved = self.write_batch(table_name, model, buffer, unique_fields)
+            self.stdout.write(self.style.SUCCESS(f'Saved {saved} {table_name} records'))
+
+    def write_batch(self, table_name, model, buffer, unique_fields):
+        """
+        Upsert one table's buffered instances.
+
+        The batch is written under a savepoint. If the database rejects it, the
+        rows are retried one at a time so a single bad record does not cost the
+        rest of the batch; rows that still fail are recorded in self.failed and
+        reported once at the end of the import.
+
+        Parameters:
+            table_name (str): The lowercase table name.
+            model (Model): The model class of the instances.
+            buffer (dict): Unsaved instances keyed on their conflict fields.
+            unique_fields (list): The conflict fields.
+
+        Returns:
+            int: The number of instances saved.
+        """
+        update_fields = self.get_update_fields(table_name)
+        try:
+            with transaction.atomic():
+                self.upsert(model, list(buffer.values()), unique_fields, update_fields)
+            return len(buffer)
+        except (DataError, IntegrityError):
+            pass
+
+        saved = 0
+        for key, instance in buffer.items():
+            try:
+                with transaction.atomic():
+                    self.upsert(model, [instance], unique_fields, update_fields)
+                saved += 1
+            except (DataError, IntegrityError):
+                self.failed.append((table_name, key))
+        return saved
+
+    def upsert(self, model, instances, unique_fields, update_fields):
+        """
+        Insert instances, updating the rows that already exist, with the fastest
+        method the database backend offers.
+
+        Parameters:
+            model (Model): The model class of the instances.
+            instances (list): Unsaved model instances.
+            unique_fields (list): The conflict fields.
+            update_fields (list): The fields overwritten on conflict.
+        """
+        if connection.vendor == 'postgresql':
+            self.copy_upsert(model, instances, unique_fields, update_fields)
+        elif connection.vendor == 'sqlite':
+            self.executemany_upsert(model, instances, unique_fields, update_fields)
+        else:
+            model.objects.bulk_create(
+                instances,
+                batch_size=self.Batch_Size,
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=update_fields,
+            )
+
+    def copy_upsert(self, model, instances, unique_fields, update_fields):
+        """
+        Upsert instances on PostgreSQL through COPY instead of a multi-row INSERT.
+
+        The rows are streamed with COPY ... FROM STDIN into a temporary staging
+        table, which skips per-row statement parsing, and then merged into the
+        model's table with one INSERT ... SELECT ... ON CONFLICT DO UPDATE, so
+        the result is the same as the bulk_create path. The staging table is
+        dropped when the import transaction commits.
+
+        Parameters:
+            model (Model): The model class the instances belong to.
+            instances (iterable): Unsaved model instances.
+            unique_fields (list): The conflict fields.
+            update_fields (list): The fields overwritten on conflict.
+        """
+        quote_name = connection.ops.quote_name
+        fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+        table = quote_name(model._meta.db_table)
+        stage = quote_name(f'{model._meta.db_table}_stage')
+        columns = ', '.join(quote_name(field.column) for field in fields)
+
+        # Serialise the rows in COPY text format: tab separated, \N for NULL
+        data = io.StringIO()
+        for instance in instances:
+            values = []
+            for field in fields:
+                value = field.get_db_prep_save(getattr(instance, field.attname), connection)
+                if value is None:
+                    values.append('\\N')
+                elif isinstance(value, bool):
+                    values.append('t' if value else 'f')
+                else:
+                    values.append(str(value).translate(_COPY_ESCAPES))
+            data.write('\t'.join(values))
+            data.write('\n')
+        data.seek(0)
+
+        copy_sql = f'COPY {stage} ({columns}) FROM STDIN'
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TEMPORARY TABLE IF NOT EXISTS {stage} ON COMMIT DROP '
+                f'AS SELECT {columns} FROM {table} WITH NO DATA'
+            )
+            cursor.execute(f'TRUNCATE {stage}')
+
+            # The raw driver cursor bypasses Django's error translation, so wrap
+            # the COPY to get django.db errors (a value too long for a varchar
+            # column is a DataError) that write_batch() can retry row by row
+            raw_cursor = cursor.cursor
+            with connection.wrap_database_errors:
+                if hasattr(raw_cursor, 'copy_expert'):
+                    # psycopg2
+                    raw_cursor.copy_expert(copy_sql, data)
+                else:
+                    # psycopg 3
+                    with raw_cursor.copy(copy_sql) as copy:
+                        copy.write(data.getvalue())
+
+            cursor.execute(
+                f'INSERT INTO {table} ({columns}) SELECT {columns} FROM {stage} '
+                + self.on_conflict_sql(model, unique_fields, update_fields)
+            )
+
+    def executemany_upsert(self, model, instances, unique_fields, update_fields):
+        """
+        Upsert instances on SQLite with one prepared single-row statement run
+        through executemany().
+
+        bulk_create compiles SQL for every value of every row, and SQLite's limit
+        on bound parameters splits each batch into statements of a few dozen rows.
+        Here the statement is built once, and only each field's database value
+        is computed per row, with the converters from row_converters().
+
+        Parameters:
+            model (Model): The model class the instances belong to.
+            instances (iterable): Unsaved model instances.
+            unique_fields (list): The conflict fields.
+            update_fields (list): The fields overwritten on conflict.
+        """
+        quote_name = connection.ops.quote_name
+        fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+        sql = 'INSERT INTO {} ({}) VALUES ({}) {}'.format(
+            quote_name(model._meta.db_table),
+            ', '.join(quote_name(field.column) for field in fields),
+            ', '.join(['%s'] * len(fields)),
+            self.on_conflict_sql(model, unique_fields, update_fields),
+        )
+        converters = self.row_converters(fields)
+        rows = [
+            [convert(getattr(instance, attname)) for attname, convert in converters]
+            for instance in instances
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+
+    def row_converters(self, fields):
+        """
+        Pick, once per batch, the function that turns each field's value into
+        its database value.
+
+        Plain numeric, text and boolean fields only need get_prep_value(). The
+        other fields (dates, times, UUIDs, foreign keys) go through
+        get_db_prep_save() with the resolved connection, which skips the
+        thread-local lookup behind django.db.connection on every value.
+
+        Parameters:
+            fields (list): The concrete fields being written.
+
+        Returns:
+            list: (attname, converter) pairs in the order of fields.
+        """
+        db = transaction.get_connection()
+        converters = []
+        for field in fields:
+            if field.get_internal_type() in _PLAIN_FIELD_TYPES:
+                convert = field.get_prep_value
             else:
-                self.stdout.write(self.style.WARNING(f'No import method for table: {table_name}'))
+                convert = partial(field.get_db_prep_save, connection=db)
+            converters.append((field.attname, convert))
+        return converters
+
+    def on_conflict_sql(self, model, unique_fields, update_fields):
+        """
+        Build the ON CONFLICT ... DO UPDATE clause shared by the raw upserts.
+
+        Parameters:
+            model (Model): The model class being written.
+            unique_fields (list): The conflict fields.
+            update_fields (list): The fields overwritten on conflict.
+
+        Returns:
+            str: The clause, valid on both PostgreSQL and SQLite.
+        """
+        quote_name = connection.ops.quote_name
+        conflict = ', '.join(quote_name(model._meta.get_field(name).column) for name in unique_fields)
+        updates = ', '.join(
+            f'{column} = EXCLUDED.{column}'
+            for column in (quote_name(model._meta.get_field(name).column) for name in update_fields)
+        )
+        return f'ON CONFLICT ({conflict}) DO UPDATE SET {updates}'
+
+    def get_update_fields(self, table_name):
+        """
+        Return the fields overwritten when an imported record already exists.
+
+        Parameters:
+            table_name (str): The lowercase table name of the records.
+
+        Returns:
+            list: Every concrete field of the table's model except the primary key,
+            the conflict fields and the fields listed in Unmapped_Fields.
+        """
+        model, unique_fields = self.Table_Models[table_name]
+        skip = set(unique_fields).union(self.Unmapped_Fields.get(table_name, ()))
+        return [
+            field.name for field in model._meta.concrete_fields
+            if not field.primary_key and field.name not in skip
+        ]
 
     def get_valid_date(self, value):
         """
@@ -71,7 +675,7 @@ class Command(BaseCommand):
         """
         if isinstance(value, str) and value:
             try:
-                return datetime.strptime(value, '%Y-%m-%d').date()
+                return _parse_date(value)
             except ValueError:
                 self.stdout.write(self.style.WARNING(f"Invalid date format for value: {value}. Skipping."))
         elif value is None or value == '':
@@ -80,23 +684,23 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING(f"Unexpected value type for date conversion: {type(value)}. Skipping."))
         return None
 
-    def get_valid_decimal(self, value, default=0):
+    def get_valid_float(self, value, default=0.0):
         """
-        Convert value to Decimal if valid, otherwise return the default.
+        Convert value to float if valid, otherwise return the default.
         
         Parameters:
-            value (str): The value to convert to Decimal.
-            default (Decimal): The default value to return if conversion fails.
+            value (str): The value to convert to float.
+            default (float): The default value to return if conversion fails.
         
         Returns:
-            Decimal: The converted Decimal object, or the default value.
+            float: The converted value, or the default value.
         """
         if value:
             try:
-                return Decimal(value)
-            except (InvalidOperation, ValueError) as e:
-                self.stdout.write(self.style.WARNING(f"Invalid decimal value for {value}: {e}.  Using default value {default}."))
-        return Decimal(default)
+                return float(value)
+            except (ValueError, TypeError) as e:
+                self.stdout.write(self.style.WARNING(f"Invalid float value for {value}: {e}.  Using default value {default}."))
+        return default
 
     def get_valid_integer(self, value):
         """
@@ -142,433 +746,363 @@ class Command(BaseCommand):
         Returns:
             bool: True if the GUID is valid, False otherwise.
         """
-        if guid and isinstance(guid, str) and len(guid) == 36:  # Example validation
-            return True
-        return False
+        return isinstance(guid, str) and _GUID_RE.fullmatch(guid) is not None
+
+    def parse_guid(self, guid):
+        """
+        Parse a GUID string into a UUID.
+        
+        Parameters:
+            guid (str): The GUID string to parse.
+        
+        Returns:
+            UUID: The parsed GUID, or None if it is missing or invalid.
+        """
+        if self.validate_guid(guid):
+            # The pattern only admits strings uuid.UUID() accepts
+            return uuid.UUID(guid)
+        return None
 
-    def import_aircraft(self, record):
+    def import_aircraft(self, record, guid):
         """
         Import Aircraft data from the provided record.
         
         Parameters:
             record (dict): A dictionary representing the Aircraft record to import.
+            guid (UUID): The record's parsed GUID, or None if it is invalid.
         
         Returns:
-            None
+            The unsaved instance, or None if the record is skipped.
         """
+        if guid is None:
+            self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {record.get("guid")}'))
+            return
+
         meta = record['meta']
+        get = meta.get  # Bound once; called for every field below
 
-        # Create or update the Aircraft record
-        aircraft, created = Aircraft.objects.update_or_create(
-            guid=uuid.UUID(record['guid']),
-            defaults={
-                'user_id': record['user_id'],
-                'platform': record['platform'],
-                '_modified': record['_modified'],
-                'make': meta.get('Make', ''),
-                'model': meta.get('Model', ''),
-                'category': meta.get('Category', 0),
-                'aircraft_class': meta.get('Class', 0),
-                'power': meta.get('Power', 0),
-                'seats': meta.get('Seats', 0),
-                'active': meta.get('Active', False),
-                'reference': meta.get('Reference', ''),
-                'tailwheel': meta.get('Tailwheel', False),
-                'complex': meta.get('Complex', False),
-                'high_perf': meta.get('HighPerf', False),
-                'aerobatic': meta.get('Aerobatic', False),
-                'fnpt': meta.get('FNPT', 0),
-                'kg5700': meta.get('Kg5700', False),
-                'rating': meta.get('Rating', ''),
-                'company': meta.get('Company', ''),
-                'cond_log': meta.get('CondLog', 0),
-                'fav_list': meta.get('FavList', False),
-                'sub_model': meta.get('SubModel', ''),
-                'record_modified': meta.get('Record_Modified', 0),
-                'engyype' : meta.get('EngType', 0)
-            }
+        # Build the Aircraft instance; handle() saves it in bulk
+        return Aircraft(
+            guid=guid,
+            user_id=record['user_id'],
+            platform=record['platform'],
+            _modified=record['_modified'],
+            make=get('Make', ''),
+            model=get('Model', ''),
+            category=get('Category', 0),
+            aircraft_class=get('Class', 0),
+            power=get('Power', 0),
+            seats=get('Seats', 0),
+            active=get('Active', False),
+            reference=get('Reference', ''),
+            tailwheel=get('Tailwheel', False),
+            complex=get('Complex', False),
+            high_perf=get('HighPerf', False),
+            aerobatic=get('Aerobatic', False),
+            fnpt=get('FNPT', 0),
+            kg5700=get('Kg5700', False),
+            rating=get('Rating', ''),
+            company=get('Company', ''),
+            cond_log=get('CondLog', 0),
+            fav_list=get('FavList', False),
+            sub_model=get('SubModel', ''),
+            record_modified=get('Record_Modified', 0),
+            engyype=get('EngType', 0)
         )
 
-        if created:
-            self.stdout.write(self.style.SUCCESS(f'Created new Aircraft: {aircraft.reference}'))
-        else:
-            self.stdout.write(self.style.SUCCESS(f'Updated Aircraft: {aircraft.reference}'))
-
-        # Assign the Aircraft to a Flight if a Flight record exists
-        try:
-            flight_instance = Flight.objects.get(guid=uuid.UUID(record['guid']))
-            flight_instance.aircraft = aircraft
-            flight_instance.save()
-            self.stdout.write(self.style.SUCCESS(f'Assigned Aircraft to Flight: {flight_instance.guid}'))
-        except Flight.DoesNotExist:
-            self.stdout.write(self.style.WARNING(f'No Flight found with guid: {record.get("FlightGuid", "")}'))
-            
-        if created:
-            self.stdout.write(self.style.SUCCESS(f'Created new Aircraft: {aircraft.reference}'))
-        else:
-            self.stdout.write(self.style.SUCCESS(f'Updated Aircraft: {aircraft.reference}'))
-            
-    def import_flights(self, record):
+    def import_flights(self, record, guid):
         """
         Import Flight data from the provided record.
         
         Parameters:
             record (dict): A dictionary representing the Flight record to import.
+            guid (UUID): The record's parsed GUID, or None if it is invalid.
         
         Returns:
-            None
+            The unsaved instance, or None if the record is skipped.
         """
-        guid = record.get('guid')
-        if not self.validate_guid(guid):
-            self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {guid}'))
+        if guid is None:
+            self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {record.get("guid")}'))
             return
 
         meta = record['meta']
+        get = meta.get
 
-        # Create or update the Flight record
-        flight, created = Flight.objects.update_or_create(
-            guid=uuid.UUID(guid),
-            defaults={
-                'user_id': record.get('user_id', 0),
-                'platform': record.get('platform', 0),
-                '_modified': record.get('_modified', 0),
-                # 'aircraft_id': meta.get('AircraftCode', ''),
-                'from_airport': meta.get('ArrCode', ''),  # Assuming 'ArrCode' as 'from_airport'
-                'to_airport': meta.get('DepCode', ''),    # Assuming 'DepCode' as 'to_airport'
-                'route': meta.get('Route', ''),
-                'date': self.get_valid_date(meta.get('DateUTC', '')),
-                'time_out': self.get_valid_time(meta.get('ArrTimeUTC', '')),
-                'time_off': self.get_valid_time(meta.get('DepTimeUTC', '')),
-                'time_on': self.get_valid_time(meta.get('LdgTimeUTC', '')),
-                'time_in': self.get_valid_time(meta.get('ArrTimeUTC', '')),  # Consider replacing if another field is more appropriate
-                'on_duty': self.get_valid_time(meta.get('ArrOffset', '')),
-                'off_duty': self.get_valid_time(meta.get('DepOffset', '')),
-                'total_time': self.get_valid_decimal(meta.get('minTOTAL', 0)),  # Based on available fields, `minTOTAL` seems closest
-                'pic': self.get_valid_decimal(meta.get('minPIC', 0)),
-                'sic': self.get_valid_decimal(meta.get('minCOP', 0)),  # Assuming 'minCOP' as 'SIC'
-                'night': self.get_valid_decimal(meta.get('minNIGHT', 0)),
-                'solo': self.get_valid_decimal(meta.get('minSFR', 0)),
-                'cross_country': self.get_valid_decimal(meta.get('minXC', 0)),
-                'nvg': self.get_valid_decimal(meta.get('minNIGHT', 0)),  # Assuming 'minNIGHT' for NVG, adjust if necessary
-                'nvg_ops': self.get_valid_decimal(meta.get('minAIR', 0)),
-                'distance': self.get_valid_decimal(meta.get('FuelUsed', 0)),  # No direct distance field found, 'FuelUsed' may be a placeholder
-                'day_takeoffs': self.get_valid_integer(meta.get('ToDay', 0)),  # Assuming 'ToDay' might represent day takeoffs
-                'day_landings_full_stop': self.get_valid_integer(meta.get('LdgDay', 0)),  # Assuming 'LdgDay' represents day landings full stop
-                'night_takeoffs': self.get_valid_integer(meta.get('ToNight', 0)),  # Assuming 'ToNight' might represent night takeoffs
-                'night_landings_full_stop': self.get_valid_integer(meta.get('LdgNight', 0)),
-                'all_landings': self.get_valid_integer(meta.get('Holding', 0)),  # 'Holding' used as a placeholder, adjust if necessary
-                'actual_instrument': self.get_valid_decimal(meta.get('minINSTR', 0)),
-                'simulated_instrument': self.get_valid_decimal(meta.get('minIFR', 0)),  # No direct field for simulated instrument found
-                'hobbs_start': self.get_valid_decimal(meta.get('HobbsIn', 0)),
-                'hobbs_end': self.get_valid_decimal(meta.get('HobbsOut', 0)),
-                'tach_start': self.get_valid_decimal(meta.get('ArrTimeSCHED', 0)),  # Placeholder for tach start
-                'tach_end': self.get_valid_decimal(meta.get('DepTimeSCHED', 0)),    # Placeholder for tach end
-                'holds': self.get_valid_integer(meta.get('Holding', 0)),
-                'approach': meta.get('TagApproach', ''),
-                'dual_given': self.get_valid_decimal(meta.get('minDUAL', 0)),
-                'simulated_flight': self.get_valid_decimal(meta.get('minEXAM', 0)),  # Placeholder for simulated flight
-                'ground_training': self.get_valid_decimal(meta.get('Training', 0)),
-                'instructor_comments': meta.get('Remarks', ''),
-                'pilot_comments': meta.get('Remarks', ''),
-                'flight_review': meta.get('ToEdit', False),  # Using 'ToEdit' as a placeholder
-                'checkride': meta.get('NextPage', False),
-                'ipc': meta.get('UserBool', False),  # Assuming 'UserBool' for IPC status
-                'nvg_proficiency': meta.get('PF', False)  # Assuming 'PF' represents NVG proficiency
-            }
+        # Build the Flight instance; handle() saves it in bulk
+        flight = Flight(
+            guid=guid,
+            user_id=record.get('user_id', 0),
+            platform=record.get('platform', 0),
+            _modified=record.get('_modified', 0),
+            from_airport=get('ArrCode', ''),  # Assuming 'ArrCode' as 'from_airport'
+            to_airport=get('DepCode', ''),    # Assuming 'DepCode' as 'to_airport'
+            route=get('Route', ''),
+            date=self.get_valid_date(get('DateUTC', '')),
+            time_out=self.get_valid_time(get('ArrTimeUTC', '')),
+            time_off=self.get_valid_time(get('DepTimeUTC', '')),
+            time_on=self.get_valid_time(get('LdgTimeUTC', '')),
+            time_in=self.get_valid_time(get('ArrTimeUTC', '')),  # Consider replacing if another field is more appropriate
+            on_duty=self.get_valid_time(get('ArrOffset', '')),
+            off_duty=self.get_valid_time(get('DepOffset', '')),
+            total_time=self.get_valid_float(get('minTOTAL', 0)),  # Based on available fields, `minTOTAL` seems closest
+            pic=self.get_valid_float(get('minPIC', 0)),
+            sic=self.get_valid_float(get('minCOP', 0)),  # Assuming 'minCOP' as 'SIC'
+            night=self.get_valid_float(get('minNIGHT', 0)),
+            solo=self.get_valid_float(get('minSFR', 0)),
+            cross_country=self.get_valid_float(get('minXC', 0)),
+            nvg=self.get_valid_float(get('minNIGHT', 0)),  # Assuming 'minNIGHT' for NVG, adjust if necessary
+            nvg_ops=self.get_valid_float(get('minAIR', 0)),
+            distance=self.get_valid_float(get('FuelUsed', 0)),  # No direct distance field found, 'FuelUsed' may be a placeholder
+            day_takeoffs=self.get_valid_integer(get('ToDay', 0)),  # Assuming 'ToDay' might represent day takeoffs
+            day_landings_full_stop=self.get_valid_integer(get('LdgDay', 0)),  # Assuming 'LdgDay' represents day landings full stop
+            night_takeoffs=self.get_valid_integer(get('ToNight', 0)),  # Assuming 'ToNight' might represent night takeoffs
+            night_landings_full_stop=self.get_valid_integer(get('LdgNight', 0)),
+            all_landings=self.get_valid_integer(get('Holding', 0)),  # 'Holding' used as a placeholder, adjust if necessary
+            actual_instrument=self.get_valid_float(get('minINSTR', 0)),
+            simulated_instrument=self.get_valid_float(get('minIFR', 0)),  # No direct field for simulated instrument found
+            hobbs_start=self.get_valid_float(get('HobbsIn', 0)),
+            hobbs_end=self.get_valid_float(get('HobbsOut', 0)),
+            tach_start=self.get_valid_float(get('ArrTimeSCHED', 0)),  # Placeholder for tach start
+            tach_end=self.get_valid_float(get('DepTimeSCHED', 0)),    # Placeholder for tach end
+            holds=self.get_valid_integer(get('Holding', 0)),
+            approach=get('TagApproach', ''),
+            dual_given=self.get_valid_float(get('minDUAL', 0)),
+            simulated_flight=self.get_valid_float(get('minEXAM', 0)),  # Placeholder for simulated flight
+            ground_training=self.get_valid_float(get('Training', 0)),
+            instructor_comments=get('Remarks', ''),
+            pilot_comments=get('Remarks', ''),
+            flight_review=get('ToEdit', False),  # Using 'ToEdit' as a placeholder
+            checkride=get('NextPage', False),
+            ipc=get('UserBool', False),  # Assuming 'UserBool' for IPC status
+            nvg_proficiency=get('PF', False)  # Assuming 'PF' represents NVG proficiency
         )
 
-        if created:
-            self.stdout.write(self.style.SUCCESS(f'Created new Flight: {flight.guid}'))
-        else:
-            self.stdout.write(self.style.SUCCESS(f'Updated Flight: {flight.guid}'))
+        # The aircraft's primary key is only known once it is saved, so keep its
+        # GUID for resolve_aircraft() to map when the flight is written
+        flight.aircraft_guid = self.parse_guid(get('AircraftCode'))
+        return flight
             
-    def import_imagepic(self, record):
+    def import_imagepic(self, record, guid):
         """Import ImagePic data."""
-        guid = record.get('guid')
-        if not self.validate_guid(guid):
-            self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {guid}'))
+        if guid is None:
+            self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {record.get("guid")}'))
             return
         meta = record['meta']
+        get = meta.get
         
-        # Create or update the ImagePic record
-        imagepic, created = ImagePic.objects.update_or_create(
-            guid=uuid.UUID(guid),
+        # Build the ImagePic instance; handle() saves it in bulk
+        return ImagePic(
+            guid=guid,
             img_code=meta['ImgCode'],
-            defaults={
-                'user_id': record['user_id'],
-                'platform': record['platform'],
-                '_modified': record['_modified'],
-                'file_ext': meta.get('FileExt', ''),
-                'file_name': meta.get('FileName', ''),
-                'link_code': meta.get('LinkCode', ''),
-                'img_upload': meta.get('Img_Upload', ''),
-                'img_download': meta.get('Img_Download', ''),
-                'record_modified': meta.get('Record_Modified', 0),
-            }
+            user_id=record['user_id'],
+            platform=record['platform'],
+            _modified=record['_modified'],
+            file_ext=get('FileExt', ''),
+            file_name=get('FileName', ''),
+            link_code=get('LinkCode', ''),
+            img_upload=get('Img_Upload', ''),
+            img_download=get('Img_Download', ''),
+            record_modified=get('Record_Modified', 0),
         )
-        if created:
-            self.stdout.write(self.style.SUCCESS(f'Created new ImagePic: {imagepic.img_code}'))
-        else:
-            self.stdout.write(self.style.SUCCESS(f'Updated ImagePic: {imagepic.img_code}'))
 
-    def import_limitrules(self, record):
+    def import_limitrules(self, record, guid):
         """Import LimitRules data."""
-        guid = record.get('guid')
-        if not self.validate_guid(guid):
-            self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {guid}'))
+        if guid is None:
+            self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {record.get("guid")}'))
             return
 
         meta = record['meta']
+        get = meta.get
 
-        # Create or update the LimitRules record
-        limitrules, created = LimitRules.objects.update_or_create(
+        # Build the LimitRules instance; handle() saves it in bulk
+        return LimitRules(
             user_id=record.get('user_id', 0),
-            limit_code=uuid.UUID(meta.get('LimitCode', '')),
+            limit_code=uuid.UUID(get('LimitCode', '')),
             platform=record.get('platform', 0),
-            defaults={
-                'guid': uuid.UUID(guid),  
-                '_modified': record.get('_modified', 0),
-                'l_from': self.get_valid_date(meta.get('LFrom', '')),
-                'l_to': self.get_valid_date(meta.get('LTo', '')),
-                'l_type': meta.get('LType', 0),
-                'l_zone': meta.get('LZone', 0),
-                'l_minutes': meta.get('LMinutes', 0),
-                'l_period_code': meta.get('LPeriodCode', 0),
-                'record_modified': meta.get('Record_Modified', 0),
-            }
+            guid=guid,
+            _modified=record.get('_modified', 0),
+            l_from=self.get_valid_date(get('LFrom', '')),
+            l_to=self.get_valid_date(get('LTo', '')),
+            l_type=get('LType', 0),
+            l_zone=get('LZone', 0),
+            l_minutes=get('LMinutes', 0),
+            l_period_code=get('LPeriodCode', 0),
+            record_modified=get('Record_Modified', 0),
         )
-        if created:
-            self.stdout.write(self.style.SUCCESS(f'Created new LimitRules: {limitrules.limit_code}'))
-        else:
-            self.stdout.write(self.style.SUCCESS(f'Updated LimitRules: {limitrules.limit_code}'))
 
-    def import_myquery(self, record):
+    def import_myquery(self, record, guid):
         """Import MyQuery data."""
-        guid = record.get('guid')
-        if not self.validate_guid(guid):
-            self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {guid}'))
+        if guid is None:
+            self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {record.get("guid")}'))
             return
 
         meta = record['meta']
+        get = meta.get
 
-        # Create or update the Query record
-        query, created = Query.objects.update_or_create(
-            guid=uuid.UUID(guid),
-            defaults={
-                'name': meta.get('Name', ''),
-                'mQCode': meta.get('mQCode', ''),
-                'quick_view': meta.get('QuickView', False),
-                'short_name': meta.get('ShortName', ''),
-                'record_modified': meta.get('Record_Modified', 0),
-                'user_id': record.get('user_id', 0),
-                'platform': record.get('platform', 0),
-                '_modified': record.get('_modified', 0),
-            }
+        # Build the Query instance; handle() saves it in bulk
+        return Query(
+            guid=guid,
+            name=get('Name', ''),
+            mQCode=get('mQCode', ''),
+            quick_view=get('QuickView', False),
+            short_name=get('ShortName', ''),
+            record_modified=get('Record_Modified', 0),
+            user_id=record.get('user_id', 0),
+            platform=record.get('platform', 0),
+            _modified=record.get('_modified', 0),
         )
 
-        if created:
-            self.stdout.write(self.style.SUCCESS(f'Created new Query: {query.name}'))
-        else:
-            self.stdout.write(self.style.SUCCESS(f'Updated Query: {query.name}'))
-
-
-    def import_myquerybuild(self, record):
+    def import_myquerybuild(self, record, guid):
         """Import MyQueryBuild data."""
-        guid = record.get('guid')
-        if not self.validate_guid(guid):
-            self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {guid}'))
+        if guid is None:
+            self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {record.get("guid")}'))
             return
 
         meta = record['meta']
+        get = meta.get
         
-        # Create or update the MyQueryBuild record
-        myquerybuild, created = MyQueryBuild.objects.update_or_create(
-            guid=uuid.UUID(guid),
-            defaults={
-                'user_id': record.get('user_id', 0),
-                'platform': record.get('platform', 0),
-                '_modified': record.get('_modified', 0),
-                'build1': meta.get('Build1', ''),
-                'build2': meta.get('Build2', 0),
-                'build3': meta.get('Build3', 0),
-                'build4': meta.get('Build4', ''),
-                'mQCode': meta.get('mQCode', ''),
-                'mQBCode': meta.get('mQBCode', ''),
-                'record_modified': meta.get('Record_Modified', 0),
-            }
+        # Build the MyQueryBuild instance; handle() saves it in bulk
+        return MyQueryBuild(
+            guid=guid,
+            user_id=record.get('user_id', 0),
+            platform=record.get('platform', 0),
+            _modified=record.get('_modified', 0),
+            build1=get('Build1', ''),
+            build2=get('Build2', 0),
+            build3=get('Build3', 0),
+            build4=get('Build4', ''),
+            mQCode=get('mQCode', ''),
+            mQBCode=get('mQBCode', ''),
+            record_modified=get('Record_Modified', 0),
         )
-        
-        if created:
-            self.stdout.write(self.style.SUCCESS(f'Created new MyQueryBuild: {myquerybuild.guid}'))
-        else:
-            self.stdout.write(self.style.SUCCESS(f'Updated MyQueryBuild: {myquerybuild.guid}'))
 
-    def import_pilot(self, record):
+    def import_pilot(self, record, guid):
         """Import Pilot data."""
-        guid = record.get('guid')
-        if not self.validate_guid(guid):
-            self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {guid}'))
+        if guid is None:
+            self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {record.get("guid")}'))
             return
 
         meta = record['meta']
+        get = meta.get
         
-        # Create or update the Pilot record
-        pilot, created = Pilot.objects.update_or_create(
-            guid=uuid.UUID(guid),
-            defaults={
-                'user_id': record.get('user_id', 0),
-                'platform': record.get('platform', 0),
-                '_modified': record.get('_modified', 0),
-                'notes': meta.get('Notes', ''),
-                'active': meta.get('Active', False),
-                'company': meta.get('Company', ''),
-                'fav_list': meta.get('FavList', False),
-                'user_api': meta.get('UserAPI', ''),
-                'facebook': meta.get('Facebook', ''),
-                'linkedin': meta.get('LinkedIn', ''),
-                'pilot_ref': meta.get('PilotRef', ''),
-                'pilot_code': meta.get('PilotCode', ''),
-                'pilot_name': meta.get('PilotName', ''),
-                'pilot_email': meta.get('PilotEMail', ''),
-                'pilot_phone': meta.get('PilotPhone', ''),
-                'certificate': meta.get('Certificate', ''),
-                'phone_search': meta.get('PhoneSearch', ''),
-                'pilot_search': meta.get('PilotSearch', ''),
-                'roster_alias': meta.get('RosterAlias', ''),
-                'record_modified': meta.get('Record_Modified', 0),
-            }
+        # Build the Pilot instance; handle() saves it in bulk
+        return Pilot(
+            guid=guid,
+            user_id=record.get('user_id', 0),
+            platform=record.get('platform', 0),
+            _modified=record.get('_modified', 0),
+            notes=get('Notes', ''),
+            active=get('Active', False),
+            company=get('Company', ''),
+            fav_list=get('FavList', False),
+            user_api=get('UserAPI', ''),
+            facebook=get('Facebook', ''),
+            linkedin=get('LinkedIn', ''),
+            pilot_ref=get('PilotRef', ''),
+            pilot_code=get('PilotCode', ''),
+            pilot_name=get('PilotName', ''),
+            pilot_email=get('PilotEMail', ''),
+            pilot_phone=get('PilotPhone', ''),
+            certificate=get('Certificate', ''),
+            phone_search=get('PhoneSearch', ''),
+            pilot_search=get('PilotSearch', ''),
+            roster_alias=get('RosterAlias', ''),
+            record_modified=get('Record_Modified', 0),
         )
-        
-        if created:
-            self.stdout.write(self.style.SUCCESS(f'Created new Pilot: {pilot.pilot_name.encode("ascii", "ignore").decode("ascii")}'))
-            # self.stdout.write(self.style.SUCCESS(f'Created new Pilot: {pilot.pilot_name}'))
-            # print(f'Created new Pilot: {pilot.pilot_name}')
 
-        else:
-            self.stdout.write(self.style.SUCCESS(f'Updated Pilot: {pilot.pilot_name.encode("ascii", "ignore").decode("ascii")}'))
-            # self.stdout.write(self.style.SUCCESS(f'Updated Pilot: {pilot.pilot_name}'))
-            # print(f'Updated Pilot: {pilot.pilot_name}')
-
-
-    def import_qualification(self, record):
+    def import_qualification(self, record, guid):
         """Import Qualification data."""
-        guid = record.get('guid')
-        if not self.validate_guid(guid):
-            self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {guid}'))
+        if guid is None:
+            self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {record.get("guid")}'))
             return
 
         meta = record['meta']
+        get = meta.get
     
-        # Create or update the Qualification record
-        qualification, created = Qualification.objects.update_or_create(
-            guid=uuid.UUID(guid),
-            defaults={
-                'user_id': record.get('user_id', 0),
-                'platform': record.get('platform', 0),
-                '_modified': record.get('_modified', 0),
-                'q_code': uuid.UUID(meta.get('QCode')),
-                'ref_extra': meta.get('RefExtra', 0),
-                'ref_model': meta.get('RefModel', ''),
-                'validity': meta.get('Validity', 0),
-                'date_valid': self.get_valid_date(meta.get('DateValid', '')),
-                'q_type_code': meta.get('QTypeCode', 0),
-                'date_issued': self.get_valid_date(meta.get('DateIssued', '')),
-                'minimum_qty': meta.get('MinimumQty', 0),
-                'notify_days': meta.get('NotifyDays', 0),
-                'ref_airfield': meta.get('RefAirfield', uuid.uuid4()),  # Default UUID if missing
-                'minimum_period': meta.get('MinimumPeriod', 0),
-                'notify_comment': meta.get('NotifyComment', ''),
-                'record_modified': meta.get('Record_Modified', 0),
-            }
+        # Build the Qualification instance; handle() saves it in bulk
+        return Qualification(
+            guid=guid,
+            user_id=record.get('user_id', 0),
+            platform=record.get('platform', 0),
+            _modified=record.get('_modified', 0),
+            q_code=uuid.UUID(get('QCode')),
+            ref_extra=get('RefExtra', 0),
+            ref_model=get('RefModel', ''),
+            validity=get('Validity', 0),
+            date_valid=self.get_valid_date(get('DateValid', '')),
+            q_type_code=get('QTypeCode', 0),
+            date_issued=self.get_valid_date(get('DateIssued', '')),
+            minimum_qty=get('MinimumQty', 0),
+            notify_days=get('NotifyDays', 0),
+            ref_airfield=get('RefAirfield') or uuid.uuid4(),  # Default UUID if missing
+            minimum_period=get('MinimumPeriod', 0),
+            notify_comment=get('NotifyComment', ''),
+            record_modified=get('Record_Modified', 0),
         )
 
-        if created:
-            self.stdout.write(self.style.SUCCESS(f'Created new Qualification: {qualification.guid}'))
-        else:
-            self.stdout.write(self.style.SUCCESS(f'Updated Qualification: {qualification.guid}'))
-
-
-    def import_settingconfig(self, record):
+    def import_settingconfig(self, record, guid):
         """Import SettingConfig data."""
-        guid = record.get('guid')
-        if isinstance(guid, str):
-            if not self.validate_guid(guid):
-                self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {guid}'))
-                # If the guid is not a valid UUID, convert numeric string to UUID
-                if guid.isdigit():
-                    # Generate a UUID with the numeric value appended
-                    base_uuid = uuid.UUID('00000000-0000-0000-0000-000000000000')
-                    # Create UUID based on the numeric value
-                    new_uuid = uuid.UUID(int=(base_uuid.int + int(guid)))
-                    guid = str(new_uuid)
-                    print(f"Created guid is : {guid}")
-                else:
-                    raise ValueError("Invalid GUID format")
-        else:
-            raise ValueError("GUID must be a string")
+        if guid is None:
+            raw_guid = record.get('guid')
+            if not isinstance(raw_guid, str):
+                raise ValueError("GUID must be a string")
+            # If the guid is not a valid UUID, convert numeric string to UUID
+            if raw_guid.isdigit():
+                # Generate a UUID with the numeric value appended
+                base_uuid = uuid.UUID('00000000-0000-0000-0000-000000000000')
+                # Create UUID based on the numeric value
+                guid = uuid.UUID(int=(base_uuid.int + int(raw_guid)))
+                if self.verbosity >= 2:
+                    self.stdout.write(f"Created guid is : {guid}")
+            else:
+                self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {raw_guid}'))
+                raise ValueError("Invalid GUID format")
 
         meta = record['meta']
+        get = meta.get
 
-        # Create or update the SettingConfig record
-        setting_config, created = SettingConfig.objects.update_or_create(
-            guid=uuid.UUID(guid),
-            defaults={
-                'user_id': record.get('user_id', 0),
-                'platform': record.get('platform', 0),
-                'config_code': meta.get('ConfigCode', 0),
-                '_modified': record.get('_modified', 0),
-                'name': meta.get('Name', ''),
-                'group': meta.get('Group', ''),
-                'data': meta.get('Data', ''),
-                'record_modified': meta.get('Record_Modified', 0),
-            }
+        # Build the SettingConfig instance; handle() saves it in bulk
+        return SettingConfig(
+            guid=guid,
+            user_id=record.get('user_id', 0),
+            platform=record.get('platform', 0),
+            config_code=get('ConfigCode', 0),
+            _modified=record.get('_modified', 0),
+            name=get('Name', ''),
+            group=get('Group', ''),
+            data=get('Data', ''),
+            record_modified=get('Record_Modified', 0),
         )
 
-        if created:
-            self.stdout.write(self.style.SUCCESS(f'Created new SettingConfig: {setting_config.guid}'))
-        else:
-            self.stdout.write(self.style.SUCCESS(f'Updated SettingConfig: {setting_config.guid}'))
-
-
-    def import_airfield(self, record):
+    def import_airfield(self, record, guid):
         """Import Airfield data."""
-        try:
-            guid = record.get('guid')
-            if not self.validate_guid(guid):
-                self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {guid}'))
-                return
-        except TypeError as e:
-            print("Error occurred:", e)
+        if guid is None:
+            self.stdout.write(self.style.ERROR(f'Invalid or missing GUID: {record.get("guid")}'))
+            return
         meta = record['meta']
+        get = meta.get
 
-        # Create or update the Airfield record
-        airfield, created = Airfield.objects.update_or_create(
-            guid=uuid.UUID(guid),
-            defaults={
-                'user_id': record.get('user_id', 0),
-                'platform': record.get('platform', 0),
-                '_modified': record.get('_modified', 0),
-                'af_code': meta.get('AFCode', ''),
-                'af_iata': meta.get('AFIATA', ''),
-                'af_icao': meta.get('AFICAO', ''),
-                'af_name': meta.get('AFName', ''),
-                'city': meta.get('City', ''),
-                'af_cat': meta.get('AFCat', 0),
-                'tz_code': meta.get('TZCode', 0),
-                'latitude': meta.get('Latitude', 0),
-                'longitude': meta.get('Longitude', 0),
-                'show_list': meta.get('ShowList', False),
-                'user_edit': meta.get('UserEdit', False),
-                'af_country': meta.get('AFCountry', 0),
-                'notes': meta.get('Notes', ''),
-                'notes_user': meta.get('NotesUser', ''),
-                'region_user': meta.get('RegionUser', 0),
-                'elevation_ft': meta.get('ElevationFT', 0),
-                'record_modified': meta.get('Record_Modified', 0),
-            }
+        # Build the Airfield instance; handle() saves it in bulk
+        return Airfield(
+            guid=guid,
+            user_id=record.get('user_id', 0),
+            platform=record.get('platform', 0),
+            _modified=record.get('_modified', 0),
+            af_code=get('AFCode', ''),
+            af_iata=get('AFIATA', ''),
+            af_icao=get('AFICAO', ''),
+            af_name=get('AFName', ''),
+            city=get('City', ''),
+            af_cat=get('AFCat', 0),
+            tz_code=get('TZCode', 0),
+            latitude=get('Latitude', 0),
+            longitude=get('Longitude', 0),
+            show_list=get('ShowList', False),
+            user_edit=get('UserEdit', False),
+            af_country=get('AFCountry', 0),
+            notes=get('Notes', ''),
+            notes_user=get('NotesUser', ''),
+            region_user=get('RegionUser', 0),
+            elevation_ft=get('ElevationFT', 0),
+            record_modified=get('Record_Modified', 0),
         )
-        
-        if created:
-            self.stdout.write(self.style.SUCCESS(f'Created new Airfield: {airfield.guid}'))
-        else:
-            self.stdout.write(self.style.SUCCESS(f'Updated Airfield: {airfield.guid}'))
@@ -0,0 +1,21 @@
+# Generated by Django 5.1 on 2026-10-15 01:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pilotlog', '0003_aircraft_engyype_alter_flight_aircraft_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['user_id', 'date'], name='flight_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['user_id', 'aircraft_id'], name='flight_user_aircraft_idx'),
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.1 on 2026-10-15 01:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pilotlog', '0004_flight_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='flight',
+            name='actual_instrument',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='cross_country',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='distance',
+            field=models.FloatField(),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='dual_given',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='ground_training',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='hobbs_end',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='hobbs_start',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='night',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='nvg',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='nvg_ops',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='pic',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='sic',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='simulated_flight',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='simulated_instrument',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='solo',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='tach_end',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='tach_start',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='total_time',
+            field=models.FloatField(),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1 on 2026-10-15 01:49
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pilotlog', '0005_flight_float_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='airfield',
+            index=models.Index(fields=['af_icao'], name='airfield_icao_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='airfield',
+            index=models.Index(fields=['af_iata'], name='airfield_iata_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['date'], name='flight_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='imagepic',
+            index=models.Index(condition=models.Q(('img_download', True), ('img_upload', True)), fields=['record_modified'], name='imagepic_up_dn_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='imagepic',
+            index=models.Index(fields=['record_modified'], name='imagepic_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='imagepic',
+            index=models.Index(django.db.models.functions.text.Lower('file_ext'), models.F('record_modified'), condition=models.Q(('img_upload', True)), name='imagepic_up_ext_modified_idx'),
+        ),
+    ]
@@ -0,0 +1,108 @@
+# Generated by Django 5.1 on 2026-10-15 01:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pilotlog', '0006_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='aircraft',
+            name='_modified',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='aircraft',
+            name='record_modified',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='airfield',
+            name='_modified',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='airfield',
+            name='record_modified',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='_modified',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='imagepic',
+            name='_modified',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='imagepic',
+            name='record_modified',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='limitrules',
+            name='_modified',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='limitrules',
+            name='record_modified',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='myquerybuild',
+            name='_modified',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='myquerybuild',
+            name='record_modified',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='pilot',
+            name='_modified',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='pilot',
+            name='record_modified',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='qualification',
+            name='_modified',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='qualification',
+            name='record_modified',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='query',
+            name='_modified',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='query',
+            name='record_modified',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='settingconfig',
+            name='_modified',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='settingconfig',
+            name='record_modified',
+            field=models.BigIntegerField(),
+        ),
+    ]
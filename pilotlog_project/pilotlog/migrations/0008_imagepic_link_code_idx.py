@@ -0,0 +1,17 @@
+# Generated by Django 5.1 on 2026-10-15 01:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pilotlog', '0007_bigint_modified'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='imagepic',
+            index=models.Index(fields=['link_code'], name='imagepic_link_code_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1 on 2026-10-15 01:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pilotlog', '0008_imagepic_link_code_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagepic',
+            name='linked_flight',
+            field=models.ForeignObject(editable=False, from_fields=['link_code'], null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='images', serialize=False, to='pilotlog.flight', to_fields=['guid']),
+        ),
+    ]
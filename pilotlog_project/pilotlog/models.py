@@ -1,7 +1,10 @@
+import time
 import uuid
-from django.db import models
+from django.db import connections, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.expressions import OrderByList
+from django.db.models.functions import Cast, Coalesce, Concat, JSONObject, Lower, Substr
 from django.core.exceptions import ValidationError
-from django.utils import timezone
 
 # Base class to include common fields
 class BaseModel(models.Model):
@@ -12,16 +15,62 @@ class BaseModel(models.Model):
         user_id (IntegerField): ID of the user who created or modified the record.
         guid (UUIDField): Unique identifier for the record.
         platform (IntegerField): Platform ID associated with the record.
-        _modified (IntegerField): Timestamp or integer representing the last modification.
+        _modified (BigIntegerField): Timestamp or integer representing the last modification.
     """
     user_id = models.IntegerField()
     guid = models.UUIDField(unique=True)
     platform = models.IntegerField()
-    _modified = models.IntegerField()
+    _modified = models.BigIntegerField()
 
     class Meta:
         abstract = True
 
+    @classmethod
+    def bulk_ingest(cls, rows, batch_size=1000):
+        """
+        Create or update records from dicts of field values, matched on guid.
+
+        When a guid repeats within rows, the last row wins. The stored guids are looked up one batch at a time. New records
+        are inserted with bulk_create and existing ones rewritten with
+        bulk_update, batch_size rows per statement, instead of a save() per record.
+        A new record that clashes with a stored one on another unique field
+        raises IntegrityError rather than being dropped. Ingesting images clears
+        the cached uploaded and downloadable image list, as saving one does.
+
+        Returns a tuple of (created, updated) counts.
+        """
+        to_python = cls._meta.get_field('guid').to_python
+        instances = {}
+        for row in rows:
+            instance = cls(**row)
+            instance.guid = to_python(instance.guid)
+            instances[instance.guid] = instance
+        instances = list(instances.values())
+
+        existing = {}
+        for start in range(0, len(instances), batch_size):
+            guids = [instance.guid for instance in instances[start:start + batch_size]]
+            existing.update(cls.objects.filter(guid__in=guids).values_list('guid', 'pk'))
+
+        to_create, to_update = [], []
+        for instance in instances:
+            pk = existing.get(instance.guid)
+            if pk is None:
+                to_create.append(instance)
+            else:
+                instance.pk = pk
+                to_update.append(instance)
+
+        cls.objects.bulk_create(to_create, batch_size=batch_size)
+        if to_update:
+            fields = [field.name for field in cls._meta.concrete_fields if not field.primary_key and field.name != 'guid']
+            cls.objects.bulk_update(to_update, fields, batch_size=batch_size)
+        if issubclass(cls, ImagePic):
+            # Bulk writes send no post_save signals, so drop the cached image list here
+            from .signals import clear_image_cache  # signals imports this module
+            clear_image_cache(cls)
+        return len(to_create), len(to_update)
+
 # Aircraft Model
 class Aircraft(BaseModel):
     """
@@ -48,7 +97,7 @@ class Aircraft(BaseModel):
         cond_log (IntegerField): Condition log identifier.
         fav_list (BooleanField): Indicates if the aircraft is in the favorite list.
         sub_model (CharField): Sub-model of the aircraft.
-        record_modified (IntegerField): Timestamp or integer representing the last modification.
+        record_modified (BigIntegerField): Timestamp or integer representing the last modification.
     """
     make = models.CharField(max_length=100)
     model = models.CharField(max_length=100)
@@ -70,11 +119,150 @@ class Aircraft(BaseModel):
     cond_log = models.IntegerField()
     fav_list = models.BooleanField()
     sub_model = models.CharField(max_length=100, blank=True)
-    record_modified = models.IntegerField()
+    record_modified = models.BigIntegerField()
 
     def __str__(self):
         return f"{self.make} {self.model} ({self.reference})"
 
+# Database-side JSON building, used by FlightQuerySet.with_nested()
+
+class JSONArrayAgg(models.Aggregate):
+    """
+    Aggregates values into a JSON array: json_group_array() on SQLite,
+    jsonb_agg() on PostgreSQL and JSON_ARRAYAGG() elsewhere.
+
+    ``ordering`` sorts the elements, as for ArrayAgg, where the database takes
+    an ORDER BY inside an aggregate (see supports_ordering()); elsewhere the
+    elements come in the order the rows are read.
+    """
+    function = 'JSON_ARRAYAGG'
+    template = '%(function)s(%(distinct)s%(expressions)s%(ordering)s)'
+    output_field = models.JSONField()
+
+    def __init__(self, *expressions, ordering=(), **extra):
+        self.order_by = OrderByList(*ordering) if ordering else None
+        super().__init__(*expressions, **extra)
+
+    def resolve_expression(self, *args, **kwargs):
+        if self.order_by is not None:
+            self.order_by = self.order_by.resolve_expression(*args, **kwargs)
+        return super().resolve_expression(*args, **kwargs)
+
+    def get_source_expressions(self):
+        return super().get_source_expressions() + [self.order_by]
+
+    def set_source_expressions(self, exprs):
+        *exprs, self.order_by = exprs
+        return super().set_source_expressions(exprs)
+
+    @staticmethod
+    def supports_ordering(connection):
+        """Whether the database takes an ORDER BY inside the aggregate."""
+        if connection.vendor == 'sqlite':
+            return connection.Database.sqlite_version_info >= (3, 44)
+        if connection.vendor == 'mysql':
+            return connection.mysql_is_mariadb
+        return True
+
+    def as_sql(self, compiler, connection, **extra_context):
+        if self.order_by is None or not self.supports_ordering(connection):
+            return super().as_sql(compiler, connection, ordering='', **extra_context)
+        ordering_sql, ordering_params = compiler.compile(self.order_by)
+        sql, params = super().as_sql(compiler, connection, ordering=f' {ordering_sql}', **extra_context)
+        # ORDER BY follows the aggregated expressions, which have no FILTER here
+        return sql, (*params, *ordering_params)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, function='JSON_GROUP_ARRAY', **extra_context)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, function='JSONB_AGG', **extra_context)
+
+
+class AsJSON(models.Func):
+    """
+    Marks a subquery's text result as JSON, so SQLite nests it as an array
+    instead of quoting it as a string. Other databases keep the JSON type
+    across subqueries, so the expression is passed through.
+    """
+    template = '%(expressions)s'
+    output_field = models.JSONField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template='JSON(%(expressions)s)', **extra_context)
+
+
+class UUIDText(models.Func):
+    """
+    A UUID column as dashed lowercase text, the form the API serializers
+    write. PostgreSQL casts its native uuid. Databases that store UUIDs as
+    32 hex characters (SQLite, MySQL) get the dashes put back in.
+    """
+    output_field = models.CharField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        column = self.source_expressions[0]
+        if connection.features.has_native_uuid_field:
+            return compiler.compile(Cast(column, models.TextField()))
+        return compiler.compile(Concat(
+            Substr(column, 1, 8), Value('-'), Substr(column, 9, 4), Value('-'),
+            Substr(column, 13, 4), Value('-'), Substr(column, 17, 4), Value('-'),
+            Substr(column, 21),
+        ))
+
+
+class FlightQuerySet(models.QuerySet):
+    def with_nested(self, user_id):
+        """
+        Return a user's flights, each with its aircraft and linked images, as a
+        JSON array text built by the database in a single query, ready to be
+        sent as is. Flights are in date order, images in the order they were stored.
+        """
+        images = (
+            ImagePic.objects.filter(link_code=OuterRef('guid'))
+            .values('link_code')
+            .annotate(items=JSONArrayAgg(JSONObject(
+                file_name='file_name', file_ext='file_ext', img_code=UUIDText('img_code'),
+            ), ordering=['pk']))
+            .values('items')
+        )
+        flight = JSONObject(
+            guid=UUIDText('guid'),
+            date='date',
+            from_airport='from_airport',
+            to_airport='to_airport',
+            total_time='total_time',
+            aircraft=JSONObject(
+                guid=UUIDText('aircraft_id__guid'), make='aircraft_id__make', model='aircraft_id__model',
+            ),
+            # An empty list, as FlightSerializer gives, for flights without images
+            images=AsJSON(Coalesce(Subquery(images), Value('[]'), output_field=models.JSONField())),
+        )
+        flights = self.filter(user_id=user_id)
+        connection = connections[self.db]
+        if JSONArrayAgg.supports_ordering(connection) or connection.vendor != 'sqlite':
+            data = flights.aggregate(
+                data=Cast(JSONArrayAgg(flight, ordering=['date', 'pk']), models.TextField())
+            )['data']
+        else:
+            # Older SQLite aggregates the rows in the order they are read, so
+            # read them from a sorted subquery. (The images of a flight are read
+            # through imagepic_link_code_idx, which lists them in id order.)
+            sql, params = flights.order_by('date', 'pk').values(item=flight).query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT JSON_GROUP_ARRAY(JSON(item)) FROM ({sql})', params)
+                data = cursor.fetchone()[0]
+        # The aggregate is NULL when the user has no flights
+        return data or '[]'
+
+
+class FlightManager(models.Manager):
+    def get_queryset(self):
+        return FlightQuerySet(self.model, using=self._db)
+
+    def with_nested(self, user_id):
+        return self.get_queryset().with_nested(user_id)
+
 # Flight Model
 class Flight(BaseModel):
     """
@@ -92,31 +280,31 @@ class Flight(BaseModel):
         time_in (TimeField): Time of arrival.
         on_duty (TimeField): Duty start time.
         off_duty (TimeField): Duty end time.
-        total_time (DecimalField): Total flight time.
-        pic (DecimalField): Pilot-in-command time.
-        sic (DecimalField): Second-in-command time.
-        night (DecimalField): Night flying time.
-        solo (DecimalField): Solo flying time.
-        cross_country (DecimalField): Cross-country flying time.
-        nvg (DecimalField): NVG (Night Vision Goggles) time.
-        nvg_ops (DecimalField): NVG operations time.
-        distance (DecimalField): Flight distance.
+        total_time (FloatField): Total flight time.
+        pic (FloatField): Pilot-in-command time.
+        sic (FloatField): Second-in-command time.
+        night (FloatField): Night flying time.
+        solo (FloatField): Solo flying time.
+        cross_country (FloatField): Cross-country flying time.
+        nvg (FloatField): NVG (Night Vision Goggles) time.
+        nvg_ops (FloatField): NVG operations time.
+        distance (FloatField): Flight distance.
         day_takeoffs (IntegerField): Number of daytime takeoffs.
         day_landings_full_stop (IntegerField): Number of daytime full-stop landings.
         night_takeoffs (IntegerField): Number of nighttime takeoffs.
         night_landings_full_stop (IntegerField): Number of nighttime full-stop landings.
         all_landings (IntegerField): Total number of landings.
-        actual_instrument (DecimalField): Actual instrument time.
-        simulated_instrument (DecimalField): Simulated instrument time.
-        hobbs_start (DecimalField): Hobbs meter start time.
-        hobbs_end (DecimalField): Hobbs meter end time.
-        tach_start (DecimalField): Tachometer start time.
-        tach_end (DecimalField): Tachometer end time.
+        actual_instrument (FloatField): Actual instrument time.
+        simulated_instrument (FloatField): Simulated instrument time.
+        hobbs_start (FloatField): Hobbs meter start time.
+        hobbs_end (FloatField): Hobbs meter end time.
+        tach_start (FloatField): Tachometer start time.
+        tach_end (FloatField): Tachometer end time.
         holds (IntegerField): Number of holds.
         approach (CharField): Approach type.
-        dual_given (DecimalField): Dual instruction given time.
-        simulated_flight (DecimalField): Simulated flight time.
-        ground_training (DecimalField): Ground training time.
+        dual_given (FloatField): Dual instruction given time.
+        simulated_flight (FloatField): Simulated flight time.
+        ground_training (FloatField): Ground training time.
         instructor_name (CharField): Name of the instructor.
         instructor_comments (TextField): Comments from the instructor.
         pilot_comments (TextField): Comments from the pilot.
@@ -125,6 +313,7 @@ class Flight(BaseModel):
         ipc (BooleanField): Indicates if the flight was for IPC (Instrument Proficiency Check).
         nvg_proficiency (BooleanField): Indicates NVG proficiency.
     """
+    objects = FlightManager()
     aircraft_id = models.ForeignKey(Aircraft, on_delete=models.CASCADE, default=1)
     date = models.DateField(null=True)
     from_airport = models.CharField(max_length=100)
@@ -136,32 +325,32 @@ class Flight(BaseModel):
     time_in = models.TimeField(null=True)
     on_duty = models.TimeField(null=True)
     off_duty = models.TimeField(null=True)
-    total_time = models.DecimalField(max_digits=5, decimal_places=2)
-    pic = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
-    sic = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
-    night = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
-    solo = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
-    cross_country = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
-    nvg = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
-    nvg_ops = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
-    distance = models.DecimalField(max_digits=10, decimal_places=2)
+    total_time = models.FloatField()
+    pic = models.FloatField(blank=True, null=True)
+    sic = models.FloatField(blank=True, null=True)
+    night = models.FloatField(blank=True, null=True)
+    solo = models.FloatField(blank=True, null=True)
+    cross_country = models.FloatField(blank=True, null=True)
+    nvg = models.FloatField(blank=True, null=True)
+    nvg_ops = models.FloatField(blank=True, null=True)
+    distance = models.FloatField()
     day_takeoffs = models.IntegerField(blank=True, null=True)
     day_landings_full_stop = models.IntegerField(blank=True, null=True)
     night_takeoffs = models.IntegerField(blank=True, null=True)
     night_landings_full_stop = models.IntegerField(blank=True, null=True)
     all_landings = models.IntegerField(blank=True, null=True)
-    actual_instrument = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
-    simulated_instrument = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
-    hobbs_start = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
-    hobbs_end = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
-    tach_start = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
-    tach_end = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
+    actual_instrument = models.FloatField(blank=True, null=True)
+    simulated_instrument = models.FloatField(blank=True, null=True)
+    hobbs_start = models.FloatField(blank=True, null=True)
+    hobbs_end = models.FloatField(blank=True, null=True)
+    tach_start = models.FloatField(blank=True, null=True)
+    tach_end = models.FloatField(blank=True, null=True)
     holds = models.IntegerField(blank=True, null=True)
     approach = models.CharField(max_length=100, blank=True)
 
-    dual_given = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
-    simulated_flight = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
-    ground_training = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
+    dual_given = models.FloatField(blank=True, null=True)
+    simulated_flight = models.FloatField(blank=True, null=True)
+    ground_training = models.FloatField(blank=True, null=True)
     instructor_name = models.CharField(max_length=100, blank=True)
     instructor_comments = models.TextField(blank=True)
     pilot_comments = models.TextField(blank=True)
@@ -169,6 +358,14 @@ class Flight(BaseModel):
     checkride = models.BooleanField(default=False)
     ipc = models.BooleanField(default=False)
     nvg_proficiency = models.BooleanField(default=False)
+
+    class Meta:
+        # Logbook reads are per user, by date or by aircraft
+        indexes = [
+            models.Index(fields=['user_id', 'date'], name='flight_user_date_idx'),
+            models.Index(fields=['user_id', 'aircraft_id'], name='flight_user_aircraft_idx'),
+            models.Index(fields=['date'], name='flight_date_idx'),
+        ]
     
     def __str__(self):
         return f"Flight on {self.date} from {self.from_airport} to {self.to_airport}"
@@ -177,24 +374,33 @@ class Flight(BaseModel):
 
 # complex method using a custom Manager or QuerySet to filter or aggregate data.
 
+def _cutoff_ts(days):
+    """
+    Unix timestamp of 'days' days ago, as compared with record_modified.
+
+    The cutoff is rounded down to the minute, so every request within the same
+    minute filters on the same value.
+    """
+    return int(time.time()) // 60 * 60 - int(days * 86400)
+
+
 class ImagePicQuerySet(models.QuerySet):
     def uploaded_and_downloaded(self):
         return self.filter(img_upload=True, img_download=True)
 
     def recently_modified(self, days):
-        cutoff_date = timezone.now() - timezone.timedelta(days=days)
-        return self.filter(record_modified__gte=int(cutoff_date.timestamp()))
+        return self.filter(record_modified__gte=_cutoff_ts(days))
     
     def uploaded_images_by_extension(self, extension, days=30):
         """
-        Get images that are uploaded and match the specified file extension,
-        modified within the last 'days' days.
+        Get images that are uploaded and match the specified file extension
+        (ignoring case), modified within the last 'days' days.
         """
-        cutoff_date = timezone.now() - timezone.timedelta(days=days)
-        return self.filter(
+        # Compared as lower(file_ext), the expression imagepic_up_ext_modified_idx is built on
+        return self.alias(file_ext_lower=Lower('file_ext')).filter(
             img_upload=True,
-            file_ext=extension,
-            record_modified__gte=int(cutoff_date.timestamp())
+            file_ext_lower=extension.lower(),
+            record_modified__gte=_cutoff_ts(days)
         )
 
 class ImagePicManager(models.Manager):
@@ -207,6 +413,10 @@ class ImagePicManager(models.Manager):
     def images_modified_recently(self, days=30):
         return self.get_queryset().recently_modified(days)
 
+    def count_modified_recently(self, days=30):
+        # A SELECT COUNT(*) over the record_modified index, without fetching rows
+        return self.get_queryset().recently_modified(days).count()
+
 # ImagePic Model
 class ImagePic(BaseModel):
     """
@@ -219,16 +429,49 @@ class ImagePic(BaseModel):
         link_code (UUIDField): Code for linking related records.
         img_upload (BooleanField): Indicates if the image is uploaded.
         img_download (BooleanField): Indicates if the image is available for download.
-        record_modified (IntegerField): Timestamp or integer representing the last modification.
+        record_modified (BigIntegerField): Timestamp or integer representing the last modification.
     """
     objects = ImagePicManager()  
     file_ext = models.CharField(max_length=10)
     img_code = models.UUIDField(unique=True)
     file_name = models.CharField(max_length=255)
     link_code = models.UUIDField()
+    # The flight the image is linked to through link_code, if any, for
+    # prefetch_related('images') on flights. It has no column or constraint of
+    # its own, as link_code may also point at records of other tables, and is
+    # left out of forms and serializers
+    linked_flight = models.ForeignObject(
+        'Flight',
+        on_delete=models.DO_NOTHING,
+        from_fields=['link_code'],
+        to_fields=['guid'],
+        related_name='images',
+        null=True,
+        editable=False,
+        serialize=False,
+    )
     img_upload = models.BooleanField(default=False)
     img_download = models.BooleanField(default=False)
-    record_modified = models.IntegerField()
+    record_modified = models.BigIntegerField()
+
+    class Meta:
+        # The filters used by ImagePicQuerySet; the flag filters get partial
+        # indexes that hold only the matching rows
+        indexes = [
+            models.Index(
+                fields=['record_modified'],
+                condition=models.Q(img_upload=True, img_download=True),
+                name='imagepic_up_dn_modified_idx',
+            ),
+            models.Index(fields=['record_modified'], name='imagepic_modified_idx'),
+            models.Index(
+                Lower('file_ext'), 'record_modified',
+                condition=models.Q(img_upload=True),
+                name='imagepic_up_ext_modified_idx',
+            ),
+            # Images of a record, see FlightQuerySet.with_nested()
+            models.Index(fields=['link_code'], name='imagepic_link_code_idx'),
+        ]
 
     def __str__(self):
         return f"ImagePic {self.file_name} ({self.img_code})"
@@ -246,7 +489,7 @@ class LimitRules(BaseModel):
         l_zone (IntegerField): Zone associated with the limit rule.
         l_minutes (IntegerField): Number of minutes associated with the limit rule.
         l_period_code (IntegerField): Period code for the limit rule.
-        record_modified (IntegerField): Timestamp or integer representing the last modification.
+        record_modified (BigIntegerField): Timestamp or integer representing the last modification.
     """
     limit_code = models.UUIDField(unique=True)
     l_from = models.DateField(null=True)
@@ -255,7 +498,7 @@ class LimitRules(BaseModel):
     l_zone = models.IntegerField()
     l_minutes = models.IntegerField()
     l_period_code = models.IntegerField()
-    record_modified = models.IntegerField()
+    record_modified = models.BigIntegerField()
 
     def __str__(self):
         return f"LimitRule {self.limit_code}"
@@ -270,13 +513,13 @@ class Query(BaseModel):
         mQCode (CharField): Query code.
         quick_view (BooleanField): Indicates if the query is for quick view.
         short_name (CharField): Short name for the query.
-        record_modified (IntegerField): Timestamp or integer representing the last modification.
+        record_modified (BigIntegerField): Timestamp or integer representing the last modification.
     """
     name = models.CharField(max_length=255)
     mQCode = models.CharField(max_length=255)
     quick_view = models.BooleanField(default=False)
     short_name = models.CharField(max_length=255, blank=True)
-    record_modified = models.IntegerField()
+    record_modified = models.BigIntegerField()
 
     def __str__(self):
         return self.name
@@ -293,7 +536,7 @@ class MyQueryBuild(BaseModel):
         build4 (CharField): Custom field for query build 4.
         mQCode (UUIDField): Query code associated with the build.
         mQBCode (UUIDField): Build code associated with the query.
-        record_modified (IntegerField): Timestamp or integer representing the last modification.
+        record_modified (BigIntegerField): Timestamp or integer representing the last modification.
     """
     build1 = models.TextField()
     build2 = models.IntegerField()
@@ -301,7 +544,7 @@ class MyQueryBuild(BaseModel):
     build4 = models.CharField(max_length=255)
     mQCode = models.UUIDField()
     mQBCode = models.UUIDField()
-    record_modified = models.IntegerField()
+    record_modified = models.BigIntegerField()
 
     def __str__(self):
         return f"Build for {self.mQCode}"
@@ -328,7 +571,7 @@ class Pilot(BaseModel):
         phone_search (CharField): Phone search identifier.
         pilot_search (CharField): Pilot search identifier.
         roster_alias (CharField): Roster alias for the pilot.
-        record_modified (IntegerField): Timestamp or integer representing the last modification.
+        record_modified (BigIntegerField): Timestamp or integer representing the last modification.
     """
     notes = models.TextField(blank=True)
     active = models.BooleanField(default=False)
@@ -346,7 +589,7 @@ class Pilot(BaseModel):
     phone_search = models.CharField(max_length=255, blank=True)
     pilot_search = models.CharField(max_length=255, blank=True)
     roster_alias = models.CharField(max_length=255, blank=True)
-    record_modified = models.IntegerField()
+    record_modified = models.BigIntegerField()
 
     def __str__(self):
         return f"Pilot {self.pilot_name} ({self.pilot_code})"
@@ -369,7 +612,7 @@ class Qualification(BaseModel):
         ref_airfield (UUIDField): Reference to the airfield for the qualification.
         minimum_period (IntegerField): Minimum period required for the qualification.
         notify_comment (TextField): Notification comment.
-        record_modified (IntegerField): Timestamp or integer representing the last modification.
+        record_modified (BigIntegerField): Timestamp or integer representing the last modification.
     """
     q_code = models.UUIDField(unique=True)
     ref_extra = models.IntegerField(default=0)
@@ -383,7 +626,7 @@ class Qualification(BaseModel):
     ref_airfield = models.UUIDField(default=uuid.uuid4)
     minimum_period = models.IntegerField(default=0)
     notify_comment = models.TextField(blank=True)
-    record_modified = models.IntegerField()
+    record_modified = models.BigIntegerField()
 
     def __str__(self):
         return str(self.q_code)
@@ -398,13 +641,13 @@ class SettingConfig(BaseModel):
         name (CharField): Name of the configuration setting.
         group (CharField): Group associated with the configuration setting.
         data (TextField): Data related to the configuration setting.
-        record_modified (IntegerField): Timestamp or integer representing the last modification.
+        record_modified (BigIntegerField): Timestamp or integer representing the last modification.
     """
     config_code = models.IntegerField(unique=True)
     name = models.CharField(max_length=255)
     group = models.CharField(max_length=255)
     data = models.TextField(blank=True)
-    record_modified = models.IntegerField()
+    record_modified = models.BigIntegerField()
 
     def __str__(self):
         return f"{self.name} ({self.config_code})"
@@ -431,7 +674,7 @@ class Airfield(BaseModel):
         notes_user (TextField): User-specific notes about the airfield.
         region_user (IntegerField): Region code associated with the airfield.
         elevation_ft (IntegerField): Elevation of the airfield in feet.
-        record_modified (IntegerField): Timestamp or integer representing the last modification.
+        record_modified (BigIntegerField): Timestamp or integer representing the last modification.
     """
     af_code = models.CharField(max_length=255, unique=True)
     af_iata = models.CharField(max_length=10, blank=True)
@@ -449,7 +692,14 @@ class Airfield(BaseModel):
     notes_user = models.TextField(blank=True)
     region_user = models.IntegerField()
     elevation_ft = models.IntegerField()
-    record_modified = models.IntegerField()
+    record_modified = models.BigIntegerField()
+
+    class Meta:
+        # Airfields are looked up by their ICAO or IATA code
+        indexes = [
+            models.Index(fields=['af_icao'], name='airfield_icao_idx'),
+            models.Index(fields=['af_iata'], name='airfield_iata_idx'),
+        ]
 
     def __str__(self):
         return f"{self.af_name} ({self.af_code})"
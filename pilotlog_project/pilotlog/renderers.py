@@ -0,0 +1,31 @@
+from rest_framework.renderers import JSONRenderer
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; without it responses go through DRF's stdlib encoder
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    A JSONRenderer that encodes with orjson, which writes the UTF-8 bytes of a
+    whole list of records in C instead of through the stdlib json encoder.
+
+    Values orjson does not know natively (Decimal, lazy strings, querysets) are
+    handed to DRF's own encoder, and so are dates and times, so they are
+    formatted as JSONRenderer formats them. Without orjson installed, or when
+    the client asks for indented output, rendering falls back to JSONRenderer.
+
+    Unlike JSONRenderer, which refuses them, NaN and infinite floats are
+    written as null.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        return orjson.dumps(
+            data, default=self.encoder_class().default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
@@ -1,5 +1,9 @@
+import logging
+from django.core.exceptions import FieldDoesNotExist
 from rest_framework import serializers
-from .models import ImagePic
+from .models import Flight, ImagePic
+
+logger = logging.getLogger(__name__)
 
 
 class DynamicFieldsModelSerializer(serializers.ModelSerializer):
@@ -10,20 +14,76 @@ class DynamicFieldsModelSerializer(serializers.ModelSerializer):
     def __init__(self, *args, **kwargs):
         # Don't pass the 'fields' argument up to the superclass
         fields = kwargs.pop('fields', None)
-        print("****************************************")
         # Instantiate the superclass normally
         super(DynamicFieldsModelSerializer, self).__init__(*args, **kwargs)
 
         if fields is not None:
-            print("fields",fields)
+            logger.debug("fields=%s", fields)
             # Drop any fields that are not specified in the `fields` argument
             allowed = set(fields)
             existing = set(self.fields)
             for field_name in existing - allowed:
                 self.fields.pop(field_name)
 
+    def project_queryset(self, queryset, extra=()):
+        """
+        Restrict a queryset to the columns the remaining fields read, with
+        only(), so unrequested columns (long text fields included) are not
+        fetched. Related sources such as 'aircraft_id.make' are followed with
+        select_related(), and joins no field needs are dropped. Reverse
+        relations (such as a flight's images) keep the queryset's prefetches,
+        which are dropped when no such field is left.
+
+        The queryset is returned unchanged when a field does not map to a model
+        field (a method field or source='*'). Model field names in ``extra``
+        (such as an ordering field the view reads) are always kept.
+        """
+        opts = self.Meta.model._meta
+        paths = {opts.pk.name, *extra}
+        prefetched = False
+        for field in self.fields.values():
+            if field.source == '*':
+                return queryset
+            try:
+                model_field = opts.get_field(field.source_attrs[0])
+            except FieldDoesNotExist:
+                return queryset
+            if model_field.one_to_many:
+                # Prefetched, not selected; the parent side of the join must be loaded
+                prefetched = True
+                paths.update(getattr(model_field.field, 'to_fields', None) or [opts.pk.name])
+                continue
+            paths.add('__'.join(field.source_attrs))
+
+        if not prefetched:
+            queryset = queryset.prefetch_related(None)
+        queryset = queryset.select_related(None)
+        related = {path.rsplit('__', 1)[0] for path in paths if '__' in path}
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*paths)
+
+
+class LinkedImageSerializer(serializers.ModelSerializer):
+    """The images linked to a record, nested in its serialized output."""
+    class Meta:
+        model = ImagePic
+        fields = ['img_code', 'file_name', 'file_ext']
+
 
 class ImagePicSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = ImagePic
         fields = '__all__'  # or specify the fields you want to include
+
+
+class FlightSerializer(DynamicFieldsModelSerializer):
+    # Read from the related aircraft; FlightViewSet joins it in with select_related
+    aircraft_make = serializers.CharField(source='aircraft_id.make', read_only=True)
+    aircraft_model = serializers.CharField(source='aircraft_id.model', read_only=True)
+    # Prefetched by FlightViewSet
+    images = LinkedImageSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Flight
+        fields = '__all__'
@@ -0,0 +1,17 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import ImagePic
+
+# Cache key of the uploaded and downloadable image list; see uploaded_and_downloaded_view
+UPLOADED_DOWNLOADED_CACHE_KEY = 'imgpic:uploaded_downloaded:v1'
+
+# Seconds the cached list is kept; also bounds staleness after bulk writes, which send no signals
+UPLOADED_DOWNLOADED_CACHE_TIMEOUT = 60
+
+
+@receiver(post_save, sender=ImagePic)
+@receiver(post_delete, sender=ImagePic)
+def clear_image_cache(sender, **kwargs):
+    """Drop the cached image list whenever an image is saved or deleted."""
+    cache.delete(UPLOADED_DOWNLOADED_CACHE_KEY)
@@ -1,3 +1,459 @@
-from django.test import TestCase
+import csv
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DataError, IntegrityError, connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from . import exports, renderers
+from .management.commands.import_data import Command
+from .models import Aircraft, Airfield, Flight, ImagePic
+from .serializers import FlightSerializer, ImagePicSerializer
+from .signals import UPLOADED_DOWNLOADED_CACHE_KEY
 
-# Create your tests here.
+# Two aircraft, two flights and an image; the first flight comes before its aircraft
+IMPORT_FIXTURE = os.path.join(os.path.dirname(__file__), 'testdata', 'import_small.json')
+
+
+def airfield_row(**values):
+    """Field values for an Airfield, with the given ones overriding the defaults."""
+    row = {
+        'user_id': 1, 'guid': uuid.uuid4(), 'platform': 9, '_modified': 1700000000,
+        'af_code': 'EGLL', 'af_cat': 0, 'tz_code': 0, 'latitude': 0, 'longitude': 0,
+        'af_country': 0, 'region_user': 0, 'elevation_ft': 83, 'record_modified': 1700000000,
+    }
+    row.update(values)
+    return row
+
+
+def create_images(count, record_modified, **values):
+    """Store count images modified at the same second and return their ids, newest first."""
+    images = [
+        ImagePic.objects.create(**{
+            'user_id': 1, 'guid': uuid.uuid4(), 'platform': 9, '_modified': record_modified, 'file_ext': 'png',
+            'img_code': uuid.uuid4(), 'file_name': f'image{n}', 'link_code': uuid.uuid4(),
+            'record_modified': record_modified, **values,
+        })
+        for n in range(count)
+    ]
+    return [image.pk for image in reversed(images)]
+
+
+class BulkIngestTests(TestCase):
+    def test_creates_and_updates_by_guid(self):
+        stored = airfield_row(af_code='EGLL', af_name='Heathrow')
+        Airfield.bulk_ingest([stored])
+
+        created, updated = Airfield.bulk_ingest([
+            dict(stored, guid=str(stored['guid']), af_name='London Heathrow'),
+            airfield_row(af_code='EGKK'),
+        ])
+
+        self.assertEqual((created, updated), (1, 1))
+        self.assertEqual(Airfield.objects.count(), 2)
+        self.assertEqual(Airfield.objects.get(af_code='EGLL').af_name, 'London Heathrow')
+
+    def test_repeated_guid_is_ingested_once(self):
+        guid = uuid.uuid4()
+        created, updated = Airfield.bulk_ingest([
+            airfield_row(guid=guid, af_name='first'),
+            airfield_row(guid=str(guid), af_name='last'),
+        ])
+
+        self.assertEqual((created, updated), (1, 0))
+        self.assertEqual(Airfield.objects.get().af_name, 'last')
+
+    def test_image_ingest_clears_the_image_cache(self):
+        cache.set(UPLOADED_DOWNLOADED_CACHE_KEY, [])
+
+        ImagePic.bulk_ingest([{
+            'user_id': 1, 'guid': uuid.uuid4(), 'platform': 9, '_modified': 1700000000, 'file_ext': 'png',
+            'img_code': uuid.uuid4(), 'file_name': 'image', 'link_code': uuid.uuid4(),
+            'img_upload': True, 'img_download': True, 'record_modified': 1700000000,
+        }])
+
+        self.assertIsNone(cache.get(UPLOADED_DOWNLOADED_CACHE_KEY))
+        self.assertEqual(
+            self.client.get(reverse('uploaded_and_downloaded')).context['images'],
+            [{'file_name': 'image', 'img_upload': True, 'img_download': True}],
+        )
+
+    def test_conflict_on_other_unique_field_raises(self):
+        Airfield.bulk_ingest([airfield_row(af_code='EGLL')])
+
+        with self.assertRaises(IntegrityError):
+            Airfield.bulk_ingest([airfield_row(af_code='EGLL')])
+
+
+class StubCopyCursor:
+    """
+    Stands in for a PostgreSQL cursor in copy_upsert(): SQL statements are
+    ignored, and COPY raises the driver's own DataError (not Django's) when the
+    data holds an over-long value, as a varchar(n) staging column would.
+    """
+
+    def __init__(self):
+        self.cursor = self
+        self.copied = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, sql, params=None):
+        pass
+
+    def copy_expert(self, sql, data):
+        rows = data.getvalue().splitlines()
+        if any('X' * 11 in row for row in rows):
+            raise connection.Database.DataError('value too long for type character varying(10)')
+        self.copied.extend(rows)
+
+
+class CopyUpsertErrorTests(TestCase):
+    def test_copy_data_error_is_retried_row_by_row(self):
+        command = Command()
+        command.failed = []
+        good = Airfield(**airfield_row(af_code='EGLL'))
+        bad = Airfield(**airfield_row(af_code='EGKK', af_iata='X' * 11))
+        stub = StubCopyCursor()
+
+        with mock.patch.object(connection, 'vendor', 'postgresql'), \
+                mock.patch.object(connection, 'cursor', return_value=stub):
+            with self.assertRaises(DataError):
+                command.copy_upsert(Airfield, [bad], ['guid'], command.get_update_fields('airfield'))
+            saved = command.write_batch('airfield', Airfield, {('EGLL',): good, ('EGKK',): bad}, ['guid'])
+
+        self.assertEqual(saved, 1)
+        self.assertEqual(command.failed, [('airfield', ('EGKK',))])
+        self.assertEqual(len(stub.copied), 1)
+
+
+class ImportDataTests(TestCase):
+    def import_data(self, path=IMPORT_FIXTURE, **options):
+        """Run import_data on a file and return its output."""
+        out = StringIO()
+        call_command('import_data', path=path, stdout=out, **options)
+        return out.getvalue()
+
+    def import_records(self, records, **options):
+        """Run import_data on the given records, written to a temporary file."""
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as json_file:
+            json.dump(records, json_file)
+        self.addCleanup(os.remove, json_file.name)
+        return self.import_data(json_file.name, **options)
+
+    def load_fixture(self):
+        with open(IMPORT_FIXTURE) as json_file:
+            return json.load(json_file)
+
+    def assert_flights_linked(self):
+        self.assertEqual(
+            dict(Flight.objects.values_list('guid', 'aircraft_id__guid')),
+            {
+                uuid.UUID('26E6EC20-7BE0-4079-8092-7E4580F43098'): uuid.UUID('AB3BCD75-615B-4D6F-A391-47CC3DBEC4CF'),
+                uuid.UUID('00000000-0000-0000-0000-000000009218'): uuid.UUID('00000000-0000-0000-0000-000000000367'),
+            },
+        )
+
+    def test_fresh_import(self):
+        out = self.import_data()
+
+        self.assertIn('Read 5 records', out)
+        self.assertEqual(Aircraft.objects.count(), 2)
+        self.assertEqual(ImagePic.objects.count(), 1)
+        self.assert_flights_linked()
+
+        flight = Flight.objects.get(guid='26E6EC20-7BE0-4079-8092-7E4580F43098')
+        self.assertEqual(str(flight.date), '2023-09-05')
+        self.assertEqual(flight.total_time, 132)
+        self.assertEqual(flight.user_id, 125880)
+        self.assertEqual(flight.pilot_comments, 'ILS, RNAV, VOR, ILS - IPC')
+        aircraft = Aircraft.objects.get(guid='00000000-0000-0000-0000-000000000367')
+        self.assertEqual((aircraft.make, aircraft.model), ('Cessna', 'C150'))
+
+    def test_reimport_skips_unchanged_records(self):
+        self.import_data()
+        Flight.objects.update(total_time=0)
+
+        out = self.import_data()
+        self.assertIn('Skipped 5 records unchanged since the last import', out)
+        self.assertFalse(Flight.objects.exclude(total_time=0).exists())
+
+        out = self.import_data(force=True)
+        self.assertNotIn('Skipped', out)
+        self.assertEqual(Flight.objects.get(guid='26E6EC20-7BE0-4079-8092-7E4580F43098').total_time, 132)
+        self.assertEqual(Flight.objects.count(), 2)
+
+    def test_fresh_import_without_modified(self):
+        # import_flights() treats _modified as optional
+        records = self.load_fixture()
+        for record in records:
+            if record['table'].lower() == 'flight':
+                del record['_modified']
+
+        out = self.import_records(records)
+
+        self.assertNotIn('Skipped', out)
+        self.assert_flights_linked()
+
+    def test_reimport_writes_changed_records(self):
+        self.import_data()
+        Flight.objects.update(total_time=0)
+        records = self.load_fixture()
+        changed = next(record for record in records if record['guid'] == '26E6EC20-7BE0-4079-8092-7E4580F43098')
+        changed['_modified'] += 1
+
+        out = self.import_records(records)
+
+        self.assertIn('Skipped 4 records unchanged since the last import', out)
+        self.assertEqual(
+            dict(Flight.objects.values_list('guid', 'total_time')),
+            {
+                uuid.UUID('26E6EC20-7BE0-4079-8092-7E4580F43098'): 132,
+                uuid.UUID('00000000-0000-0000-0000-000000009218'): 0,
+            },
+        )
+
+    def test_flight_read_before_its_aircraft(self):
+        # One record per batch, so the first flight is flushed before its aircraft is read
+        with mock.patch.object(Command, 'Batch_Size', 1):
+            self.import_data()
+
+        self.assert_flights_linked()
+
+    def test_bad_row_is_retried_alone_and_reported(self):
+        records = self.load_fixture()
+        bad = next(record for record in records if record['guid'] == '00000000-0000-0000-0000-000000009218')
+        bad['user_id'] = None  # Violates NOT NULL
+
+        out = self.import_records(records)
+
+        self.assertIn('1 records could not be saved:', out)
+        self.assertIn('flight: 00000000-0000-0000-0000-000000009218', out)
+        self.assertEqual(
+            list(Flight.objects.values_list('guid', flat=True)),
+            [uuid.UUID('26E6EC20-7BE0-4079-8092-7E4580F43098')],
+        )
+        self.assertEqual(Aircraft.objects.count(), 2)
+
+
+class FlightsWithNestedTests(TestCase):
+    def test_uuids_are_dashed_and_missing_images_are_an_empty_list(self):
+        call_command('import_data', path=IMPORT_FIXTURE, stdout=StringIO())
+
+        flights = {flight['guid']: flight for flight in json.loads(Flight.objects.with_nested(125880))}
+
+        self.assertEqual(set(flights), {
+            '26e6ec20-7be0-4079-8092-7e4580f43098', '00000000-0000-0000-0000-000000009218',
+        })
+        with_image = flights['26e6ec20-7be0-4079-8092-7e4580f43098']
+        self.assertEqual(with_image['aircraft']['guid'], 'ab3bcd75-615b-4d6f-a391-47cc3dbec4cf')
+        self.assertEqual([image['img_code'] for image in with_image['images']], ['1aeecf08-1af9-4526-8ff4-5726117b4c6b'])
+        self.assertEqual(flights['00000000-0000-0000-0000-000000009218']['images'], [])
+
+    def test_flights_by_date_and_images_in_stored_order(self):
+        call_command('import_data', path=IMPORT_FIXTURE, stdout=StringIO())
+        link_code = '26E6EC20-7BE0-4079-8092-7E4580F43098'
+        # Stored in reverse of the flights' dates, so the id order is not the date order
+        Flight.objects.filter(guid=link_code).update(date=date(2024, 1, 1))
+        added = create_images(2, 1700000000, link_code=link_code)
+
+        flights = json.loads(Flight.objects.with_nested(125880))
+
+        self.assertEqual([flight['date'] for flight in flights], ['1998-03-16', '2024-01-01'])
+        self.assertEqual(
+            [image['file_name'] for image in flights[1]['images']],
+            ['1AEECF08-1AF9-4526-8FF4-5726117B4C6B'] + [ImagePic.objects.get(pk=pk).file_name for pk in reversed(added)],
+        )
+
+    def test_user_without_flights(self):
+        self.assertEqual(json.loads(Flight.objects.with_nested(1)), [])
+
+
+class ImagePaginationTests(TestCase):
+    def setUp(self):
+        now = int(time.time())
+        # Newest first: two at one second, then three sharing an older one
+        self.expected = create_images(2, now) + create_images(3, now - 60)
+
+    @mock.patch('pilotlog.views.RECENT_IMAGES_PAGE_SIZE', 2)
+    def test_recent_images_pages_across_tied_timestamps(self):
+        url = reverse('recently_modified_view')
+        seen = []
+        params = {}
+        for _ in range(4):
+            response = self.client.get(url, params)
+            seen += [image['pk'] for image in response.context['recent_images']]
+            next_page = response.context.get('next_page')
+            if not next_page:
+                break
+            params = {'before': next_page['record_modified'], 'before_id': next_page['pk']}
+
+        self.assertEqual(seen, self.expected)
+
+    @mock.patch('pilotlog.views.ImagePicCursorPagination.page_size', 2)
+    def test_api_cursor_pages_across_tied_timestamps(self):
+        url = '/pilotlog/images/?fields=id,file_name'
+        seen = []
+        while url:
+            data = self.client.get(url).json()
+            self.assertTrue(all(set(image) == {'id', 'file_name'} for image in data['results']))
+            seen += [image['id'] for image in data['results']]
+            url = data['next']
+
+        self.assertEqual(seen, self.expected)
+
+
+class FlightListTests(TestCase):
+    def setUp(self):
+        call_command('import_data', path=IMPORT_FIXTURE, stdout=StringIO())
+
+    def test_list_takes_two_queries(self):
+        # The flights with their aircraft joined in, then their images
+        with self.assertNumQueries(2):
+            data = self.client.get('/pilotlog/flights/').json()
+
+        self.assertEqual(len(data['results']), 2)
+        flight = next(flight for flight in data['results'] if flight['images'])
+        self.assertEqual(flight['aircraft_make'], Aircraft.objects.get(pk=flight['aircraft_id']).make)
+
+    def get_fields(self, fields, queries):
+        """List the flights with ?fields=, checking the query count, and return the results."""
+        with self.assertNumQueries(queries):
+            return self.client.get('/pilotlog/flights/', {'fields': fields}).json()['results']
+
+    def test_fields_of_the_flight(self):
+        # No join, no prefetch
+        flights = self.get_fields('id,date,total_time', 1)
+
+        self.assertEqual([set(flight) for flight in flights], [{'id', 'date', 'total_time'}] * 2)
+        self.assertIn(132.0, [flight['total_time'] for flight in flights])
+
+    def test_fields_of_the_aircraft(self):
+        # The aircraft joined in with the flights
+        flights = self.get_fields('id,aircraft_make,aircraft_model', 1)
+
+        self.assertEqual([set(flight) for flight in flights], [{'id', 'aircraft_make', 'aircraft_model'}] * 2)
+        self.assertEqual(
+            sorted(flight['aircraft_model'] for flight in flights),
+            sorted(Aircraft.objects.values_list('model', flat=True)),
+        )
+
+    def test_images_field(self):
+        # The flights, then their images
+        flights = self.get_fields('id,images', 2)
+
+        self.assertEqual([set(flight) for flight in flights], [{'id', 'images'}] * 2)
+        self.assertEqual(sorted(len(flight['images']) for flight in flights), [0, 1])
+        self.assertEqual(
+            set(next(flight['images'][0] for flight in flights if flight['images'])),
+            {'img_code', 'file_name', 'file_ext'},
+        )
+
+    def test_unknown_fields_are_ignored(self):
+        flights = self.get_fields('id,no_such_field', 1)
+
+        self.assertEqual([set(flight) for flight in flights], [{'id'}] * 2)
+
+    @mock.patch('pilotlog.views.FlightCursorPagination.page_size', 1)
+    def test_list_is_paginated(self):
+        url = '/pilotlog/flights/'
+        seen = []
+        while url:
+            data = self.client.get(url).json()
+            self.assertLessEqual(len(data['results']), 1)
+            seen += [flight['id'] for flight in data['results']]
+            url = data['next']
+
+        self.assertEqual(seen, sorted(Flight.objects.values_list('pk', flat=True), reverse=True))
+
+
+class ExportTests(TransactionTestCase):
+    # Committed data, as run_export() reads it from worker threads with their own connections
+    def setUp(self):
+        call_command('import_data', path=IMPORT_FIXTURE, stdout=StringIO())
+        self.out_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.out_dir)
+
+    def read_csv(self, name):
+        with open(os.path.join(self.out_dir, name), newline='', encoding='utf-8') as csv_file:
+            return list(csv.reader(csv_file))
+
+    def test_columns_and_headers(self):
+        self.assertEqual(exports.run_export(self.out_dir), (2, 2))
+
+        aircraft = self.read_csv('export_aircraft.csv')
+        self.assertEqual(aircraft[0][:5], ['AircraftID', 'EquipmentType', 'TypeCode', 'Year', 'Make'])
+        self.assertEqual(tuple(aircraft[0]), exports.AIRCRAFT_HEADERS)
+        self.assertEqual({len(row) for row in aircraft}, {14})
+
+        flights = self.read_csv('export_flight.csv')
+        self.assertEqual(flights[0][:4], ['Date', 'AircraftID', 'From', 'To'])
+        self.assertEqual(flights[0][-1], 'PilotComments')
+        self.assertEqual(tuple(flights[0]), exports.FLIGHT_HEADERS)
+        self.assertEqual({len(row) for row in flights}, {63})
+        row = dict(zip(flights[0], next(row for row in flights[1:] if row[0] == '2023-09-05')))
+        self.assertEqual((row['TotalTime'], row['Approach2'], row['PilotComments']), ('132.0', '', 'ILS, RNAV, VOR, ILS - IPC'))
+
+    @mock.patch('pilotlog.exports.PAGE_SIZE', 1)
+    def test_rows_across_pages(self):
+        aircraft_count = exports.export_aircraft_to_csv(os.path.join(self.out_dir, 'aircraft.csv'))
+        flight_count = exports.export_flights_to_csv(os.path.join(self.out_dir, 'flights.csv'))
+
+        self.assertEqual((aircraft_count, flight_count), (2, 2))
+        self.assertEqual(len(self.read_csv('aircraft.csv')), 3)
+        flights = self.read_csv('flights.csv')
+        self.assertEqual(len(flights), 3)
+        # One row per flight, in primary key order
+        self.assertEqual(
+            [row[1] for row in flights[1:]],
+            [str(pk) for pk in Flight.objects.order_by('pk').values_list('aircraft_id', flat=True)],
+        )
+
+    def test_gzip_matches_plain_output(self):
+        exports.run_export(self.out_dir)
+        exports.run_export(self.out_dir, compress=True)
+
+        for name in ('export_aircraft.csv', 'export_flight.csv'):
+            path = os.path.join(self.out_dir, name)
+            with open(path, 'rb') as plain, gzip.open(path + '.gz') as compressed:
+                self.assertEqual(compressed.read(), plain.read())
+
+
+@unittest.skipIf(renderers.orjson is None, 'orjson is not installed')
+class ORJSONRendererTests(TestCase):
+    def assert_renders_as_json_renderer(self, data):
+        self.assertEqual(renderers.ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_serialized_records(self):
+        call_command('import_data', path=IMPORT_FIXTURE, stdout=StringIO())
+
+        self.assert_renders_as_json_renderer(FlightSerializer(Flight.objects.all(), many=True).data)
+        self.assert_renders_as_json_renderer(ImagePicSerializer(ImagePic.objects.all(), many=True).data)
+
+    def test_values_orjson_does_not_format_as_drf(self):
+        self.assert_renders_as_json_renderer({
+            'datetime': datetime(2023, 9, 5, 13, 20, 1, 123456, tzinfo=timezone.utc),
+            'date': date(2023, 9, 5),
+            'decimal': Decimal('1.50'),
+            'uuid': uuid.UUID('26E6EC20-7BE0-4079-8092-7E4580F43098'),
+            'text': 'Zürich – ILS',
+        })
+
+    def test_nan_is_null(self):
+        self.assertEqual(renderers.ORJSONRenderer().render({'total_time': float('nan')}), b'{"total_time":null}')
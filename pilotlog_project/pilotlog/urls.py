@@ -3,10 +3,11 @@
 from django.urls import path,include
 from .views import uploaded_and_downloaded_view,recently_modified_view
 from rest_framework.routers import DefaultRouter
-from .views import ImagePicViewSet
+from .views import FlightViewSet, ImagePicViewSet
 
 router = DefaultRouter()
 router.register(r'images', ImagePicViewSet)
+router.register(r'flights', FlightViewSet)
 
 urlpatterns = [
     path('uploaded-and-downloaded/', uploaded_and_downloaded_view, name='uploaded_and_downloaded'),
@@ -1,18 +1,41 @@
+import logging
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch, Q
+from django.http import HttpResponse
 from django.shortcuts import render
-from .models import ImagePic
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
-from .models import ImagePic
-from .serializers import ImagePicSerializer
+from .models import Flight, ImagePic
+from .serializers import FlightSerializer, ImagePicSerializer, LinkedImageSerializer
+from .signals import UPLOADED_DOWNLOADED_CACHE_KEY, UPLOADED_DOWNLOADED_CACHE_TIMEOUT
 
-def uploaded_and_downloaded_view(request):
-    # Get all images that are both uploaded and downloadable
-    uploaded_and_downloaded_images = ImagePic.objects.uploaded_and_downloaded_images()
-    
-    # Print for debugging (optional)
-    print(uploaded_and_downloaded_images)
+logger = logging.getLogger(__name__)
+
+# Images shown per page of recently_modified_view and of the image API
+RECENT_IMAGES_PAGE_SIZE = 100
+
+# Flights per page of the flight API
+FLIGHTS_PAGE_SIZE = 100
 
-    # Check if the queryset is empty and handle accordingly
+def uploaded_and_downloaded_view(request):
+    # Get all images that are both uploaded and downloadable. The list is the same
+    # for every visitor, so it is cached as plain dicts (the columns the template
+    # shows) and cleared by the signal handlers in signals.py when an image changes
+    uploaded_and_downloaded_images = cache.get_or_set(
+        UPLOADED_DOWNLOADED_CACHE_KEY,
+        lambda: list(
+            ImagePic.objects.uploaded_and_downloaded_images().values('file_name', 'img_upload', 'img_download')
+        ),
+        UPLOADED_DOWNLOADED_CACHE_TIMEOUT,
+    )
+
+    if settings.DEBUG and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("uploaded and downloaded images: count=%s", len(uploaded_and_downloaded_images))
+
+    # Check if the list is empty and handle accordingly
     if not uploaded_and_downloaded_images:
         return render(request, 'uploaded_and_downloaded.html', {
             'images': [],  # Pass an empty list if no images found
@@ -28,30 +51,65 @@ def recently_modified_view(request):
     # Get all images modified in the last 30 days
     recent_images = ImagePic.objects.images_modified_recently(1500)
 
-    # Print for debugging (optional)
-    print(recent_images)
-
-    # Check if the queryset is empty and handle accordingly
-    if not recent_images:
+    # The total shown above the list, counted apart from the page of rows
+    total = ImagePic.objects.count_modified_recently(1500)
+    if settings.DEBUG and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("recently modified images: count=%s", total)
+
+    # Keyset pagination, newest first: ?before=<record_modified>&before_id=<id> continues
+    # after the last image of the previous page, so a deep page costs the same
+    # index range scan as the first one instead of skipping OFFSET rows
+    before = request.GET.get('before', '')
+    before_id = request.GET.get('before_id', '')
+    if before.isdigit():
+        if before_id.isdigit():
+            recent_images = recent_images.filter(
+                Q(record_modified__lt=before) | Q(record_modified=before, pk__lt=before_id)
+            )
+        else:
+            recent_images = recent_images.filter(record_modified__lt=before)
+
+    # One page as plain dicts of the columns the template shows
+    page = list(
+        recent_images.order_by('-record_modified', '-pk')
+        .values('pk', 'file_name', 'img_upload', 'img_download', 'record_modified')[:RECENT_IMAGES_PAGE_SIZE]
+    )
+
+    # Check if the page is empty and handle accordingly
+    if not page:
         return render(request, 'recent_images.html', {
             'recent_images': [],  # Pass an empty list if no images found
             'message': 'No recently modified images found.'  # Provide a user-friendly message
         })
 
-    # Return a rendered template with the context
+    # Return a rendered template with the context; a full page may have a next one
     return render(request, 'recent_images.html', {
-        'recent_images': recent_images
+        'recent_images': page,
+        'total': total,
+        'next_page': page[-1] if len(page) == RECENT_IMAGES_PAGE_SIZE else None,
     })
 
 
 # image viewset
 
+class ImagePicCursorPagination(CursorPagination):
+    """
+    Keyset pagination for images, newest first; the cursor filters on
+    record_modified (indexed) instead of counting off an OFFSET. Images
+    modified in the same second are ordered by id, the same keyset as
+    recently_modified_view, so every page is reproducible.
+    """
+    page_size = RECENT_IMAGES_PAGE_SIZE
+    ordering = ('-record_modified', '-pk')
+
+
 class ImagePicViewSet(viewsets.ModelViewSet):
     """
     A viewset for viewing and editing image records.
     """
     queryset = ImagePic.objects.all()
     serializer_class = ImagePicSerializer
+    pagination_class = ImagePicCursorPagination
 
     def list(self, request, *args, **kwargs):
         """
@@ -63,9 +121,15 @@ class ImagePicViewSet(viewsets.ModelViewSet):
         fields = request.query_params.get('fields', None)  # Expecting a comma-separated list of fields
         if fields:
             fields = fields.split(',')  # Split the fields into a list
+            # Fetch only the columns of the requested fields, plus the one the
+            # pagination cursor is read from
+            queryset = self.get_serializer(fields=fields).project_queryset(
+                queryset, extra=[field.lstrip('-') for field in self.paginator.ordering]
+            )
 
-        serializer = self.get_serializer(queryset, many=True, fields=fields)
-        return Response(serializer.data)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True, fields=fields)
+        return self.get_paginated_response(serializer.data)
 
     def retrieve(self, request, *args, **kwargs):
         """
@@ -95,3 +159,62 @@ class ImagePicViewSet(viewsets.ModelViewSet):
         self.perform_update(serializer)
         return Response(serializer.data)
 
+
+# flight viewset
+
+class FlightCursorPagination(CursorPagination):
+    """
+    Keyset pagination for flights, newest first. The cursor is the primary
+    key: date would be read better, but it is nullable, and a cursor cannot
+    continue from a NULL position.
+    """
+    page_size = FLIGHTS_PAGE_SIZE
+    ordering = '-pk'
+
+
+class FlightViewSet(viewsets.ModelViewSet):
+    """
+    A viewset for viewing and editing flight records.
+    """
+    queryset = Flight.objects.all()
+    serializer_class = FlightSerializer
+    pagination_class = FlightCursorPagination
+
+    def get_queryset(self):
+        """
+        Return the flights with their aircraft joined in and their images
+        prefetched, so serializing them takes two queries instead of one or two
+        per flight. Only the image columns the serializer shows are fetched.
+        """
+        images = ImagePic.objects.only('link_code', *LinkedImageSerializer.Meta.fields)
+        return super().get_queryset().select_related('aircraft_id').prefetch_related(
+            Prefetch('images', queryset=images)
+        )
+
+    def list(self, request, *args, **kwargs):
+        """
+        Return a list of all flights with dynamic fields.
+        """
+        queryset = self.get_queryset()
+
+        # Specify fields dynamically based on query params, as for images
+        fields = request.query_params.get('fields', None)  # Expecting a comma-separated list of fields
+        if fields:
+            fields = fields.split(',')  # Split the fields into a list
+            # Fetch only the columns of the requested fields
+            queryset = self.get_serializer(fields=fields).project_queryset(queryset)
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True, fields=fields)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False)
+    def nested(self, request):
+        """
+        Return a user's flights with their aircraft and images, as JSON built
+        by the database in one query and sent without going through serializers.
+        """
+        user_id = request.query_params.get('user_id')
+        if not user_id or not user_id.isdigit():
+            return Response({'user_id': 'An integer user_id query parameter is required.'}, status=400)
+        return HttpResponse(Flight.objects.with_nested(int(user_id)), content_type='application/json')